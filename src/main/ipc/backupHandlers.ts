@@ -1,6 +1,8 @@
 import { ipcMain } from 'electron'
 import * as fs from 'fs'
 import * as path from 'path'
+import { limitFileIo } from '../utils/fileScanner'
+import { restoreRollbackRecord } from '../utils/rollback'
 
 export interface RollbackRecord {
   id: string
@@ -49,53 +51,9 @@ export function registerBackupHandlers(): void {
     }
   })
 
-  // 回滚（委托给 diff:rollback）
-  ipcMain.handle('backup:rollback', async (_event, rollbackId: string, projectRoot: string) => {
-    try {
-      if (!/^rollback_\d{8}-\d{6}$/.test(rollbackId)) {
-        return { success: false, error: '非法的回滚记录 ID' }
-      }
-
-      const backupDir = path.join(projectRoot, '.diff_backups')
-      const filePath = path.join(backupDir, `${rollbackId}.json`)
-
-      if (!fs.existsSync(filePath)) {
-        return { success: false, error: '回滚记录不存在' }
-      }
-
-      const record = JSON.parse(await fs.promises.readFile(filePath, 'utf-8'))
-      let restoredCount = 0
-      const errors: string[] = []
-
-      // 恢复修改过的文件
-      for (const [relativePath, originalContent] of Object.entries(record.files || {})) {
-        try {
-          const targetPath = path.join(projectRoot, relativePath)
-          await fs.promises.mkdir(path.dirname(targetPath), { recursive: true })
-          await fs.promises.writeFile(targetPath, originalContent as string, 'utf-8')
-          restoredCount++
-        } catch (e) {
-          errors.push(`${relativePath}: ${String(e)}`)
-        }
-      }
-
-      // 删除新创建的文件
-      for (const relativePath of (record.newFiles || [])) {
-        try {
-          const targetPath = path.join(projectRoot, relativePath)
-          if (fs.existsSync(targetPath)) {
-            await fs.promises.unlink(targetPath)
-            restoredCount++
-          }
-        } catch (e) {
-          errors.push(`删除 ${relativePath}: ${String(e)}`)
-        }
-      }
-
-      return { success: errors.length === 0, restoredCount, errors }
-    } catch (error) {
-      return { success: false, error: String(error) }
-    }
+  // 回滚（与 diff:rollback 共用同一实现）
+  ipcMain.handle('backup:rollback', (_event, rollbackId: string, projectRoot: string) => {
+    return restoreRollbackRecord(rollbackId, projectRoot)
   })
 
   // 删除回滚记录
@@ -132,19 +90,19 @@ export function registerBackupHandlers(): void {
       const s = String(now.getSeconds()).padStart(2, '0')
       const timestamp = `${y}${m}${d}-${h}${min}${s}`
 
-      const files: Record<string, string> = {}
+      // 并行读取；不存在或读取失败的文件直接跳过，无需先检查是否存在
+      const contents = await Promise.all(filePaths.map((filePath) =>
+        limitFileIo(() => fs.promises.readFile(filePath, 'utf-8')).catch(() => null)
+      ))
 
-      for (const filePath of filePaths) {
-        try {
-          if (fs.existsSync(filePath)) {
-            const relativePath = path.relative(projectRoot, filePath)
-            const content = await fs.promises.readFile(filePath, 'utf-8')
-            files[relativePath] = content
-          }
-        } catch {
-          // 忽略读取失败的文件
+      // 按传入顺序写入记录
+      const files: Record<string, string> = {}
+      filePaths.forEach((filePath, i) => {
+        const content = contents[i]
+        if (content !== null) {
+          files[path.relative(projectRoot, filePath)] = content
         }
-      }
+      })
 
       const rollbackId = `rollback_${timestamp}`
       await fs.promises.writeFile(
@@ -5,8 +5,12 @@ import {
   parseDiff,
   validateDiff,
   applyDiffToContent,
-  cleanFilePath
+  cleanFilePath,
+  DiffValidationResult,
+  FileChange
 } from '../utils/diffParser'
+import { limitFileIo } from '../utils/fileScanner'
+import { restoreRollbackRecord } from '../utils/rollback'
 
 export interface ApplyDiffResult {
   success: boolean
@@ -16,6 +20,14 @@ export interface ApplyDiffResult {
   rollbackId?: string
 }
 
+interface ApplyOperation {
+  fullPath: string
+  relativePath: string
+  originalContent: string
+  newContent: string
+  isNewFile: boolean
+}
+
 function makeTimestamp(): string {
   const now = new Date()
   const y = now.getFullYear()
@@ -27,22 +39,67 @@ function makeTimestamp(): string {
   return `${y}${m}${d}-${h}${min}${s}`
 }
 
+/**
+ * 计算 diff 目标文件的完整路径和相对路径，绝对路径只取文件名放到项目根目录下
+ * rootPrefix 为以分隔符结尾的项目根目录，由调用方在循环外计算一次；
+ * 规范化后的相对路径直接拼接，只有含 .. 等需要折叠的情况才走 path.join
+ */
+function resolveTargetPath(projectRoot: string, rootPrefix: string, newPath: string): { fullPath: string; relativePath: string } {
+  const cleanPath = cleanFilePath(newPath)
+  const relativePath = path.normalize(path.isAbsolute(cleanPath) ? path.basename(cleanPath) : cleanPath)
+
+  if (relativePath === '.' || relativePath.startsWith('..')) {
+    const fullPath = path.join(projectRoot, relativePath)
+    return { fullPath, relativePath: path.relative(projectRoot, fullPath) }
+  }
+  return { fullPath: rootPrefix + relativePath, relativePath }
+}
+
+// 验证、解析、应用通常针对同一份 diff 先后调用，缓存最近一次的结果
+let lastValidation: { content: string; result: DiffValidationResult } | null = null
+let lastParse: { content: string; result: FileChange[] } | null = null
+
+function validateDiffCached(diffContent: string): DiffValidationResult {
+  if (!lastValidation || lastValidation.content !== diffContent) {
+    lastValidation = { content: diffContent, result: validateDiff(diffContent) }
+  }
+  return lastValidation.result
+}
+
+function parseDiffCached(diffContent: string): FileChange[] {
+  if (!lastParse || lastParse.content !== diffContent) {
+    lastParse = { content: diffContent, result: parseDiff(diffContent) }
+  }
+  return lastParse.result
+}
+
 export function registerDiffHandlers(): void {
   // 验证 diff
   ipcMain.handle('diff:validate', (_event, diffContent: string) => {
-    return validateDiff(diffContent)
+    return validateDiffCached(diffContent)
   })
 
   // 解析 diff
   ipcMain.handle('diff:parse', (_event, diffContent: string) => {
     try {
-      const fileChanges = parseDiff(diffContent)
+      const fileChanges = parseDiffCached(diffContent)
       return { success: true, data: fileChanges }
     } catch (error) {
       return { success: false, error: String(error) }
     }
   })
 
+  // 验证并解析 diff，一次往返同时返回两者（验证失败时不解析）
+  ipcMain.handle('diff:prepare', (_event, diffContent: string) => {
+    try {
+      const validation = validateDiffCached(diffContent)
+      const fileChanges = validation.isValid ? parseDiffCached(diffContent) : []
+      return { success: true, validation, data: fileChanges }
+    } catch (error) {
+      return { success: false, error: String(error) }
+    }
+  })
+
   // 应用 diff（原子性：全部成功才写入，失败自动回滚）
   ipcMain.handle('diff:apply', async (_event, diffContent: string, projectRoot: string, options?: {
     createBackup?: boolean
@@ -60,53 +117,59 @@ export function registerDiffHandlers(): void {
 
     try {
       // 验证 diff
-      const validation = validateDiff(diffContent)
+      const validation = validateDiffCached(diffContent)
       if (!validation.isValid) {
         result.success = false
         return { error: validation.message, ...result }
       }
 
       // 解析 diff
-      const fileChanges = parseDiff(diffContent)
+      const fileChanges = parseDiffCached(diffContent)
       if (fileChanges.length === 0) {
         result.success = false
         return { error: '无法解析Diff内容或没有发现文件修改', ...result }
       }
 
       // ===== 阶段 1：在内存中计算所有修改，不写磁盘 =====
-      const operations: Array<{
-        fullPath: string
-        relativePath: string
-        originalContent: string
-        newContent: string
-        isNewFile: boolean
-      }> = []
-
+      // 同一文件的多段修改合并后一次应用：每个文件只读一次、写一次
+      const rootPrefix = path.join(projectRoot, path.sep)
+      const changesByPath = new Map<string, { relativePath: string; fileChange: FileChange }>()
       for (const fileChange of fileChanges) {
-        const cleanPath = cleanFilePath(fileChange.newPath)
-        const fullPath = path.isAbsolute(cleanPath)
-          ? path.join(projectRoot, path.basename(cleanPath))
-          : path.join(projectRoot, cleanPath)
+        const { fullPath, relativePath } = resolveTargetPath(projectRoot, rootPrefix, fileChange.newPath)
+
+        const existing = changesByPath.get(fullPath)
+        if (existing) {
+          existing.fileChange = { ...existing.fileChange, hunks: existing.fileChange.hunks.concat(fileChange.hunks) }
+        } else {
+          changesByPath.set(fullPath, { relativePath, fileChange })
+        }
+      }
 
+      // 各文件的读取互不依赖，在共享并发池中并行进行
+      const operations: ApplyOperation[] = await Promise.all(Array.from(changesByPath, async ([fullPath, { relativePath, fileChange }]) => {
         let originalContent = ''
-        let isNewFile = true
+        let isNewFile = false
 
-        if (fs.existsSync(fullPath)) {
-          originalContent = await fs.promises.readFile(fullPath, 'utf-8')
-          isNewFile = false
+        // 直接读取，文件不存在时按新文件处理，省去一次 existsSync
+        // 不依赖 diff 中的 /dev/null 标记：磁盘上已存在的文件仍要保留原内容以便回滚
+        try {
+          originalContent = await limitFileIo(() => fs.promises.readFile(fullPath, 'utf-8'))
+        } catch (e) {
+          if ((e as NodeJS.ErrnoException).code !== 'ENOENT') throw e
+          isNewFile = true
         }
 
         // 在内存中应用 diff（如果这一步出错，还没写任何文件）
         const newContent = applyDiffToContent(originalContent, fileChange)
 
-        operations.push({
+        return {
           fullPath,
-          relativePath: path.relative(projectRoot, fullPath),
+          relativePath,
           originalContent,
           newContent,
           isNewFile
-        })
-      }
+        }
+      }))
 
       // 预览模式到此为止
       if (dryRun) {
@@ -159,36 +222,41 @@ export function registerDiffHandlers(): void {
       }
 
       // ===== 阶段 3：原子写入所有文件，失败则回滚 =====
-      const written: string[] = []
-
-      try {
-        for (const op of operations) {
-          await fs.promises.mkdir(path.dirname(op.fullPath), { recursive: true })
-          await fs.promises.writeFile(op.fullPath, op.newContent, 'utf-8')
-          written.push(op.fullPath)
+      // 每个文件对应一个操作，各文件在共享并发池中并行写入
+      const written: ApplyOperation[] = []
+      const writeResults = await Promise.allSettled(
+        operations.map(async (op) => {
+          await limitFileIo(async () => {
+            await fs.promises.mkdir(path.dirname(op.fullPath), { recursive: true })
+            await fs.promises.writeFile(op.fullPath, op.newContent, 'utf-8')
+          })
+          written.push(op)
           result.successCount++
-        }
-      } catch (writeError) {
+        })
+      )
+
+      const writeFailure = writeResults.find(
+        (r): r is PromiseRejectedResult => r.status === 'rejected'
+      )
+      if (writeFailure) {
         // 写入中途失败 → 回滚所有已写入的文件
-        for (const op of operations) {
-          if (written.includes(op.fullPath)) {
-            try {
-              if (op.isNewFile) {
-                // 新创建的文件：删除
-                await fs.promises.unlink(op.fullPath).catch(() => { })
-              } else {
-                // 已有文件：恢复原始内容
-                await fs.promises.writeFile(op.fullPath, op.originalContent, 'utf-8')
-              }
-            } catch {
-              // 回滚失败只记录，不再抛
+        await Promise.all(written.map(async (op) => {
+          try {
+            if (op.isNewFile) {
+              // 新创建的文件：删除
+              await limitFileIo(() => fs.promises.unlink(op.fullPath)).catch(() => { })
+            } else {
+              // 已有文件：恢复原始内容
+              await limitFileIo(() => fs.promises.writeFile(op.fullPath, op.originalContent, 'utf-8'))
             }
+          } catch {
+            // 回滚失败只记录，不再抛
           }
-        }
+        }))
 
         result.success = false
-        result.errorCount = fileChanges.length - written.length
-        result.errors.push(`写入失败并已回滚: ${String(writeError)}`)
+        result.errorCount = operations.length - written.length
+        result.errors.push(`写入失败并已回滚: ${String(writeFailure.reason)}`)
         return result
       }
 
@@ -222,55 +290,8 @@ export function registerDiffHandlers(): void {
   })
 
   // 执行回滚
-  ipcMain.handle('diff:rollback', async (_event, rollbackId: string, projectRoot: string) => {
-    try {
-      // 校验 ID 安全性
-      if (!/^rollback_\d{8}-\d{6}$/.test(rollbackId)) {
-        return { success: false, error: '非法的回滚记录 ID' }
-      }
-
-      const backupDir = path.join(projectRoot, '.diff_backups')
-      const filePath = path.join(backupDir, `${rollbackId}.json`)
-
-      if (!fs.existsSync(filePath)) {
-        return { success: false, error: '回滚记录不存在' }
-      }
-
-      const record = JSON.parse(await fs.promises.readFile(filePath, 'utf-8'))
-      let restoredCount = 0
-      const errors: string[] = []
-
-      // 恢复修改过的文件
-      for (const [relativePath, originalContent] of Object.entries(record.files)) {
-        try {
-          const targetPath = path.join(projectRoot, relativePath)
-          await fs.promises.mkdir(path.dirname(targetPath), { recursive: true })
-          await fs.promises.writeFile(targetPath, originalContent as string, 'utf-8')
-          restoredCount++
-        } catch (e) {
-          errors.push(`${relativePath}: ${String(e)}`)
-        }
-      }
-
-      // 删除新创建的文件
-      if (record.newFiles) {
-        for (const relativePath of record.newFiles) {
-          try {
-            const targetPath = path.join(projectRoot, relativePath)
-            if (fs.existsSync(targetPath)) {
-              await fs.promises.unlink(targetPath)
-              restoredCount++
-            }
-          } catch (e) {
-            errors.push(`删除 ${relativePath}: ${String(e)}`)
-          }
-        }
-      }
-
-      return { success: errors.length === 0, restoredCount, errors }
-    } catch (error) {
-      return { success: false, error: String(error) }
-    }
+  ipcMain.handle('diff:rollback', (_event, rollbackId: string, projectRoot: string) => {
+    return restoreRollbackRecord(rollbackId, projectRoot)
   })
 
   // 检查文件冲突
@@ -279,17 +300,17 @@ export function registerDiffHandlers(): void {
 
     try {
       const fileChanges = parseDiff(diffContent)
+      const rootPrefix = path.join(projectRoot, path.sep)
 
       for (const change of fileChanges) {
-        const cleanPath = cleanFilePath(change.newPath)
-        const fullPath = path.isAbsolute(cleanPath)
-          ? path.join(projectRoot, path.basename(cleanPath))
-          : path.join(projectRoot, cleanPath)
+        const { fullPath } = resolveTargetPath(projectRoot, rootPrefix, change.newPath)
 
-        if (fs.existsSync(fullPath)) {
-          try {
-            await fs.promises.access(fullPath, fs.constants.W_OK)
-          } catch {
+        // 一次 access 同时判断存在与可写：文件不存在不算冲突
+        try {
+          await fs.promises.access(fullPath, fs.constants.W_OK)
+        } catch (e) {
+          const code = (e as NodeJS.ErrnoException).code
+          if (code !== 'ENOENT' && code !== 'ENOTDIR') {
             conflicts.push(`${change.newPath}: 文件只读，无法修改`)
           }
         }
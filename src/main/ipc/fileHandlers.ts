@@ -7,21 +7,52 @@ import {
   FileInfo 
 } from '../utils/fileScanner'
 
+// 正在进行的扫描，用于支持取消
+let activeScanAbortController: AbortController | null = null
+
 export function registerFileHandlers(): void {
   // 扫描目录
-  ipcMain.handle('file:scan', async (_event, rootDir: string, options?: {
+  ipcMain.handle('file:scan', async (event, rootDir: string, options?: {
     excludePatterns?: string[]
     maxFileSize?: number
+    // 由渲染进程生成的扫描 ID，随每个批次一起发回，用于丢弃旧扫描的批次
+    scanId?: number
   }) => {
+    // 新的扫描开始时取消上一次尚未结束的扫描
+    activeScanAbortController?.abort()
+    const controller = new AbortController()
+    activeScanAbortController = controller
+
     try {
       const excludePatterns = options?.excludePatterns || DEFAULT_EXCLUDE_PATTERNS
       const maxFileSize = options?.maxFileSize || 1024 * 1024
+      const scanId = options?.scanId ?? 0
       
-      const result = await scanDirectory(rootDir, excludePatterns, maxFileSize)
+      // 扫描过程中分批推送已发现的文件
+      const result = await scanDirectory(rootDir, excludePatterns, maxFileSize, (batch) => {
+        event.sender.send('file:scan-batch', scanId, batch)
+      }, controller.signal)
+
+      if (controller.signal.aborted) {
+        return { success: false, cancelled: true, error: '扫描已取消' }
+      }
       return { success: true, data: result }
     } catch (error) {
       return { success: false, error: String(error) }
+    } finally {
+      if (activeScanAbortController === controller) {
+        activeScanAbortController = null
+      }
+    }
+  })
+
+  // 取消扫描
+  ipcMain.handle('file:cancelScan', () => {
+    if (activeScanAbortController) {
+      activeScanAbortController.abort()
+      activeScanAbortController = null
     }
+    return { success: true }
   })
 
   // 生成上下文
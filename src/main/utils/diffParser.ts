@@ -9,6 +9,9 @@ export interface DiffHunk {
   newStart: number
   newCount: number
   lines: string[]
+  // 新增/删除行数，解析时顺带统计
+  additions: number
+  deletions: number
 }
 
 export interface FileChange {
@@ -26,6 +29,11 @@ export interface DiffValidationResult {
   errors: string[]
 }
 
+// 解析 hunk 头的行号信息
+const HUNK_HEADER_RE = /@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@/
+// 粘连匹配，从 lastIndex 处校验 hunk 头格式，无需先切出整行
+const HUNK_HEADER_FORMAT_RE = /@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@/y
+
 /**
  * 验证 diff 内容
  */
@@ -42,16 +50,62 @@ export function validateDiff(diffContent: string): DiffValidationResult {
     }
   }
 
-  const lines = diffContent.trim().split('\n')
+  const trimmed = diffContent.trim()
 
-  const hasFileHeaders = lines.some(line => 
-    line.startsWith('--- ') || line.startsWith('+++ ')
-  )
-  const hasHunkHeaders = lines.some(line => line.startsWith('@@'))
-  const hasChanges = lines.some(line => 
-    (line.startsWith('+') || line.startsWith('-')) && 
-    !line.startsWith('+++') && !line.startsWith('---')
-  )
+  let hasFileHeaders = false
+  let hasHunkHeaders = false
+  let hasChanges = false
+  const hunkErrors: string[] = []
+  const filePaths: string[] = []
+
+  // 单次遍历同时收集文件头、hunk 头、变更行与文件路径
+  const length = trimmed.length
+  let lineNo = 0
+  let pos = 0
+
+  while (pos <= length) {
+    let end = trimmed.indexOf('\n', pos)
+    if (end === -1) end = length
+    lineNo++
+
+    const first = pos < end ? trimmed[pos] : ''
+
+    if (first === '-' || first === '+') {
+      const isHeader = first === '-' ? trimmed.startsWith('--- ', pos) : trimmed.startsWith('+++ ', pos)
+      if (isHeader) {
+        hasFileHeaders = true
+
+        // 提取文件路径
+        let filePath = trimmed.slice(pos + 4, end).trim()
+        if (filePath.includes('\t')) {
+          filePath = filePath.split('\t')[0].trim()
+        }
+        if (filePath.startsWith('a/')) {
+          filePath = filePath.slice(2)
+        } else if (filePath.startsWith('b/')) {
+          filePath = filePath.slice(2)
+        }
+        if (filePath && filePath !== '/dev/null') {
+          filePaths.push(filePath)
+        }
+      }
+
+      // +++ / --- 开头的行不算变更行
+      if (!trimmed.startsWith(first === '-' ? '--' : '++', pos + 1)) {
+        hasChanges = true
+      }
+    } else if (first === '@' && trimmed[pos + 1] === '@') {
+      hasHunkHeaders = true
+
+      // 验证 hunk 头格式
+      HUNK_HEADER_FORMAT_RE.lastIndex = pos
+      if (!HUNK_HEADER_FORMAT_RE.test(trimmed)) {
+        hunkErrors.push(`第 ${lineNo} 行: hunk头格式不正确`)
+      }
+    }
+
+    pos = end + 1
+  }
 
   if (!hasFileHeaders) {
     warnings.push('缺少文件头信息 (--- 和 +++ 行)')
@@ -65,34 +119,7 @@ export function validateDiff(diffContent: string): DiffValidationResult {
     errors.push('没有发现实际的代码更改')
   }
 
-  // 验证 hunk 头格式
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i]
-    if (line.startsWith('@@')) {
-      if (!/^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@/.test(line)) {
-        errors.push(`第 ${i + 1} 行: hunk头格式不正确`)
-      }
-    }
-  }
-
-  // 提取文件路径
-  const filePaths: string[] = []
-  for (const line of lines) {
-    if (line.startsWith('--- ') || line.startsWith('+++ ')) {
-      let filePath = line.slice(4).trim()
-      if (filePath.includes('\t')) {
-        filePath = filePath.split('\t')[0].trim()
-      }
-      if (filePath.startsWith('a/')) {
-        filePath = filePath.slice(2)
-      } else if (filePath.startsWith('b/')) {
-        filePath = filePath.slice(2)
-      }
-      if (filePath && filePath !== '/dev/null') {
-        filePaths.push(filePath)
-      }
-    }
-  }
+  errors.push(...hunkErrors)
 
   if (filePaths.length === 0) {
     errors.push('没有找到有效的文件路径')
@@ -112,42 +139,71 @@ export function validateDiff(diffContent: string): DiffValidationResult {
   return { isValid, message, warnings, errors }
 }
 
+type HunkHeader = Omit<DiffHunk, 'lines' | 'additions' | 'deletions'>
+
+/**
+ * 构造 DiffHunk / FileChange，字段按固定顺序逐个赋值，
+ * 保证所有实例形状一致（不用展开运算符复制对象）
+ */
+function createHunk(header: HunkHeader, lines: string[], additions: number, deletions: number): DiffHunk {
+  return {
+    oldStart: header.oldStart,
+    oldCount: header.oldCount,
+    newStart: header.newStart,
+    newCount: header.newCount,
+    lines,
+    additions,
+    deletions
+  }
+}
+
+function createFileChange(file: { oldPath: string; newPath: string }, hunks: DiffHunk[]): FileChange {
+  return {
+    oldPath: file.oldPath,
+    newPath: file.newPath,
+    hunks,
+    isNewFile: file.oldPath === '/dev/null',
+    isDeletedFile: file.newPath === '/dev/null'
+  }
+}
+
 /**
  * 解析 diff 内容
+ * 用 indexOf 逐行扫描原始文本，只为需要保留的行切出字符串
  */
 export function parseDiff(diffContent: string): FileChange[] {
-  if (!diffContent.trim()) {
+  const text = diffContent.trim()
+  if (!text) {
     return []
   }
 
-  const lines = diffContent.trim().split('\n')
   const fileChanges: FileChange[] = []
   
   let currentFile: { oldPath: string; newPath: string } | null = null
   let currentHunks: DiffHunk[] = []
-  let currentHunk: { oldStart: number; oldCount: number; newStart: number; newCount: number } | null = null
+  let currentHunk: HunkHeader | null = null
   let currentHunkLines: string[] = []
+  let currentAdditions = 0
+  let currentDeletions = 0
+
+  const length = text.length
+  let pos = 0
 
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i]
+  while (pos <= length) {
+    let end = text.indexOf('\n', pos)
+    if (end === -1) end = length
 
-    if (line.startsWith('--- ')) {
+    if (text.startsWith('--- ', pos)) {
       // 保存之前的文件
       if (currentFile && currentHunks.length > 0) {
         if (currentHunk) {
-          currentHunks.push({ ...currentHunk, lines: currentHunkLines })
+          currentHunks.push(createHunk(currentHunk, currentHunkLines, currentAdditions, currentDeletions))
         }
-        fileChanges.push({
-          oldPath: currentFile.oldPath,
-          newPath: currentFile.newPath,
-          hunks: currentHunks,
-          isNewFile: currentFile.oldPath === '/dev/null',
-          isDeletedFile: currentFile.newPath === '/dev/null'
-        })
+        fileChanges.push(createFileChange(currentFile, currentHunks))
       }
 
       // 解析旧文件路径
-      let oldPath = line.slice(4).trim()
+      let oldPath = text.slice(pos + 4, end).trim()
       if (oldPath.includes('\t')) {
         oldPath = oldPath.split('\t')[0].trim()
       }
@@ -157,29 +213,32 @@ export function parseDiff(diffContent: string): FileChange[] {
 
       // 解析新文件路径
       let newPath = oldPath
-      if (i + 1 < lines.length && lines[i + 1].startsWith('+++ ')) {
-        newPath = lines[i + 1].slice(4).trim()
+      if (end < length && text.startsWith('+++ ', end + 1)) {
+        const nextStart = end + 1
+        end = text.indexOf('\n', nextStart)
+        if (end === -1) end = length
+        newPath = text.slice(nextStart + 4, end).trim()
         if (newPath.includes('\t')) {
           newPath = newPath.split('\t')[0].trim()
         }
         if (newPath.startsWith('b/')) {
           newPath = newPath.slice(2)
         }
-        i++ // 跳过 +++ 行
+        // 跳过 +++ 行
       }
 
       currentFile = { oldPath, newPath }
       currentHunks = []
       currentHunk = null
       currentHunkLines = []
-    } else if (line.startsWith('@@')) {
+    } else if (text.startsWith('@@', pos)) {
       // 保存之前的 hunk
       if (currentHunk) {
-        currentHunks.push({ ...currentHunk, lines: currentHunkLines })
+        currentHunks.push(createHunk(currentHunk, currentHunkLines, currentAdditions, currentDeletions))
       }
 
       // 解析 hunk 头
-      const match = line.match(/@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@/)
+      const match = HUNK_HEADER_RE.exec(text.slice(pos, end))
       if (match) {
         currentHunk = {
           oldStart: parseInt(match[1], 10),
@@ -188,34 +247,35 @@ export function parseDiff(diffContent: string): FileChange[] {
           newCount: parseInt(match[4] || '1', 10)
         }
         currentHunkLines = []
+        currentAdditions = 0
+        currentDeletions = 0
+      }
+    } else if (currentHunk && end > pos) {
+      const first = text[pos]
+      if (first === ' ') {
+        currentHunkLines.push(text.slice(pos, end))
+      } else if (first === '+') {
+        currentHunkLines.push(text.slice(pos, end))
+        currentAdditions++
+      } else if (first === '-') {
+        currentHunkLines.push(text.slice(pos, end))
+        currentDeletions++
       }
-    } else if (currentHunk && line.length > 0 && [' ', '+', '-'].includes(line[0])) {
-      currentHunkLines.push(line)
     }
+
+    pos = end + 1
   }
 
   // 保存最后一个文件
   if (currentFile && currentHunks.length > 0) {
     if (currentHunk) {
-      currentHunks.push({ ...currentHunk, lines: currentHunkLines })
+      currentHunks.push(createHunk(currentHunk, currentHunkLines, currentAdditions, currentDeletions))
     }
-    fileChanges.push({
-      oldPath: currentFile.oldPath,
-      newPath: currentFile.newPath,
-      hunks: currentHunks,
-      isNewFile: currentFile.oldPath === '/dev/null',
-      isDeletedFile: currentFile.newPath === '/dev/null'
-    })
+    fileChanges.push(createFileChange(currentFile, currentHunks))
   } else if (currentFile && currentHunk) {
     // 只有一个 hunk 的情况
-    currentHunks.push({ ...currentHunk, lines: currentHunkLines })
-    fileChanges.push({
-      oldPath: currentFile.oldPath,
-      newPath: currentFile.newPath,
-      hunks: currentHunks,
-      isNewFile: currentFile.oldPath === '/dev/null',
-      isDeletedFile: currentFile.newPath === '/dev/null'
-    })
+    currentHunks.push(createHunk(currentHunk, currentHunkLines, currentAdditions, currentDeletions))
+    fileChanges.push(createFileChange(currentFile, currentHunks))
   }
 
   return fileChanges
@@ -227,28 +287,25 @@ export function parseDiff(diffContent: string): FileChange[] {
 export function applyHunkToLines(lines: string[], hunk: DiffHunk): string[] {
   const startLine = hunk.oldStart - 1 // 0-indexed
 
-  // 构建结果：保留 hunk 之前的行
-  const result: string[] = []
-
-  // 1. 复制 hunk 起始行之前的所有行
-  for (let i = 0; i < startLine && i < lines.length; i++) {
-    result.push(lines[i])
-  }
+  // 1. 一次性复制 hunk 起始行之前的所有行（oldStart 为 0 时为空）
+  const result = lines.slice(0, Math.max(startLine, 0))
 
   // 2. 按顺序处理 hunk 中的行
   let oldLineIdx = startLine // 当前原文件的行指针
 
+  // 按首字符分派，上下文行最常见，放在最前面判断
   for (const hunkLine of hunk.lines) {
-    if (hunkLine.startsWith(' ')) {
+    const first = hunkLine[0]
+    if (first === ' ') {
       // 上下文行：原样保留，推进原文件指针
       result.push(lines[oldLineIdx] !== undefined ? lines[oldLineIdx] : hunkLine.slice(1))
       oldLineIdx++
-    } else if (hunkLine.startsWith('-')) {
-      // 删除行：跳过原文件中的这一行（不加入结果）
-      oldLineIdx++
-    } else if (hunkLine.startsWith('+')) {
+    } else if (first === '+') {
       // 添加行：加入结果，不推进原文件指针
       result.push(hunkLine.slice(1))
+    } else if (first === '-') {
+      // 删除行：跳过原文件中的这一行（不加入结果）
+      oldLineIdx++
     }
   }
 
@@ -260,20 +317,101 @@ export function applyHunkToLines(lines: string[], hunk: DiffHunk): string[] {
   return result
 }
 
+/**
+ * 按 oldStart 升序一次遍历应用全部 hunk
+ * hunk 重叠、起始行相同或中间 hunk 越过文件末尾时返回 null，交由逐个应用处理
+ */
+function applyHunksInOrder(lines: string[], hunks: DiffHunk[]): string[] | null {
+  const result: string[] = []
+  let oldLineIdx = 0
+  let prevStart = -1
+
+  for (const hunk of hunks) {
+    const startLine = hunk.oldStart - 1
+    if (startLine < oldLineIdx || startLine <= prevStart || oldLineIdx > lines.length) {
+      return null
+    }
+
+    // 复制两个 hunk 之间未改动的行
+    const copyEnd = Math.min(startLine, lines.length)
+    for (let i = oldLineIdx; i < copyEnd; i++) {
+      result.push(lines[i])
+    }
+    oldLineIdx = startLine
+
+    for (const hunkLine of hunk.lines) {
+      const first = hunkLine[0]
+      if (first === ' ') {
+        result.push(lines[oldLineIdx] !== undefined ? lines[oldLineIdx] : hunkLine.slice(1))
+        oldLineIdx++
+      } else if (first === '+') {
+        result.push(hunkLine.slice(1))
+      } else if (first === '-') {
+        oldLineIdx++
+      }
+    }
+
+    prevStart = startLine
+  }
+
+  // 复制最后一个 hunk 之后的剩余行
+  for (let i = oldLineIdx; i < lines.length; i++) {
+    result.push(lines[i])
+  }
+
+  return result
+}
+
 /**
  * 将 diff 应用到文件
  */
 export function applyDiffToContent(content: string, fileChange: FileChange): string {
-  let lines = content.split('\n')
-  
+  // 沿用原文件的换行符：全部为 CRLF 的文件按 \r\n 拆分、写回，新增行不会混入 LF；
+  // 混合换行的文件仍按 \n 拆分，行尾 \r 作为行内容保留，避免行号错位
+  const eol = isCrlfOnly(content) ? '\r\n' : '\n'
+  const lines = content.split(eol)
+  const hunks = eol === '\n' ? fileChange.hunks : fileChange.hunks.map(stripHunkCR)
+
+  const ascending = [...hunks].sort((a, b) => a.oldStart - b.oldStart)
+  const merged = applyHunksInOrder(lines, ascending)
+  if (merged) {
+    return merged.join(eol)
+  }
+
   // 从后往前应用 hunks，避免行号偏移问题
-  const sortedHunks = [...fileChange.hunks].sort((a, b) => b.oldStart - a.oldStart)
-  
+  let result = lines
+  const sortedHunks = [...hunks].sort((a, b) => b.oldStart - a.oldStart)
   for (const hunk of sortedHunks) {
-    lines = applyHunkToLines(lines, hunk)
+    result = applyHunkToLines(result, hunk)
   }
 
-  return lines.join('\n')
+  return result.join(eol)
+}
+
+/**
+ * 判断内容中的换行是否全部为 \r\n（至少有一个换行）
+ */
+function isCrlfOnly(content: string): boolean {
+  let pos = content.indexOf('\n')
+  if (pos === -1) return false
+
+  while (pos !== -1) {
+    if (pos === 0 || content.charCodeAt(pos - 1) !== 13) return false
+    pos = content.indexOf('\n', pos + 1)
+  }
+  return true
+}
+
+/**
+ * 去掉 hunk 行尾的 \r（CRLF 格式的 diff 拆行后会残留）
+ */
+function stripHunkCR(hunk: DiffHunk): DiffHunk {
+  return createHunk(
+    hunk,
+    hunk.lines.map(line => line.endsWith('\r') ? line.slice(0, -1) : line),
+    hunk.additions,
+    hunk.deletions
+  )
 }
 
 /**
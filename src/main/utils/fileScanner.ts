@@ -21,6 +21,23 @@ export const SUPPORTED_EXTENSIONS: Record<string, string> = {
   '.sh': 'Shell', '.bat': 'Batch', '.ps1': 'PowerShell', '.vue': 'Vue'
 }
 
+// 并发读取文件的上限（实际 I/O 由 libuv 线程池调度）
+const IO_CONCURRENCY = 16
+
+// 扫描过程中每批推送的文件数
+const SCAN_BATCH_SIZE = 500
+
+interface FileClassification {
+  size: number
+  mtimeMs: number
+  isText: boolean
+  lineCount: number
+}
+
+// 按路径缓存文件分类结果，大小和修改时间不变时重复扫描无需重新读取；
+// 只保留最近一次完整扫描遇到的文件，切换项目或文件被删除后旧条目随之丢弃
+let classificationCache = new Map<string, FileClassification>()
+
 export interface FileInfo {
   path: string
   relativePath: string
@@ -30,6 +47,8 @@ export interface FileInfo {
   sizeStr: string
   type: string
   isText: boolean
+  // 行数，扫描时统计
+  lines: number
 }
 
 export interface ScanResult {
@@ -40,6 +59,36 @@ export interface ScanResult {
   fileTypes: Record<string, number>
 }
 
+// 文本字节表：常见控制字符（\a \b \t \n \f \r ESC）及 0x20 以上的所有字节
+const TEXT_BYTES = new Uint8Array(256).fill(1, 0x20)
+for (const b of [7, 8, 9, 10, 12, 13, 27]) {
+  TEXT_BYTES[b] = 1
+}
+
+/**
+ * 根据已读取的内容判断是否为文本（只检查开头 512 字节）
+ */
+export function isTextBuffer(buffer: Buffer): boolean {
+  const sample = buffer.subarray(0, 512)
+
+  // 检查是否包含 null 字节（二进制文件的特征），由 Buffer 原生实现逐字节查找
+  if (sample.indexOf(0) !== -1) {
+    return false
+  }
+  if (sample.length === 0) {
+    return true
+  }
+
+  // 其余控制字符占比过高同样视为二进制
+  let nonText = 0
+  for (let i = 0; i < sample.length; i++) {
+    if (!TEXT_BYTES[sample[i]]) {
+      nonText++
+    }
+  }
+  return nonText / sample.length < 0.3
+}
+
 /**
  * 检查文件是否为文本文件
  */
@@ -50,18 +99,33 @@ export function isTextFile(filePath: string): boolean {
     const bytesRead = fs.readSync(fd, buffer, 0, 512, 0)
     fs.closeSync(fd)
 
-    // 检查是否包含 null 字节（二进制文件的特征）
-    for (let i = 0; i < bytesRead; i++) {
-      if (buffer[i] === 0) {
-        return false
-      }
-    }
-    return true
+    return isTextBuffer(buffer.subarray(0, bytesRead))
   } catch {
     return false
   }
 }
 
+/**
+ * 获取文件名的小写扩展名（与 path.extname 规则一致，直接处理文件名）
+ */
+function getExtension(name: string): string {
+  const dot = name.lastIndexOf('.')
+  return dot > 0 ? name.slice(dot).toLowerCase() : ''
+}
+
+/**
+ * 统计缓冲区中换行符的个数
+ */
+function countNewlines(buffer: Buffer): number {
+  let count = 0
+  let pos = buffer.indexOf(0x0a)
+  while (pos !== -1) {
+    count++
+    pos = buffer.indexOf(0x0a, pos + 1)
+  }
+  return count
+}
+
 /**
  * 获取文件大小的字符串表示
  */
@@ -75,40 +139,182 @@ export function getFileSizeStr(size: number): string {
   }
 }
 
+// 扫描结果排序用的比较器；localeCompare 每次调用都要重新解析区域设置
+const pathCollator = new Intl.Collator()
+
+// 分类时按块读取文件，块缓冲区在各次读取间复用
+const READ_CHUNK_SIZE = 64 * 1024
+const chunkPool: Buffer[] = []
+
 /**
- * 检查路径是否匹配排除模式
+ * 分块读取文件，判断是否为文本并统计行数
+ * 二进制文件读完第一块即停止；已知大小，省去 readFile 内部的一次 fstat
  */
-function matchesExcludePattern(relativePath: string, patterns: string[]): boolean {
-  const normalizedPath = relativePath.replace(/\\/g, '/')
-  const parts = normalizedPath.split('/')
-  
-  for (const pattern of patterns) {
-    // 检查完整路径
-    if (minimatch(normalizedPath, pattern)) {
-      return true
-    }
-    // 检查每个路径部分
-    for (const part of parts) {
-      if (minimatch(part, pattern)) {
-        return true
+async function classifyContent(filePath: string, size: number): Promise<{ isText: boolean; lineCount: number }> {
+  const handle = await fs.promises.open(filePath, 'r')
+  const buffer = chunkPool.pop() || Buffer.allocUnsafe(READ_CHUNK_SIZE)
+  try {
+    let offset = 0
+    let lineCount = 0
+    let lastByte = 0x0a
+
+    while (offset < size) {
+      // 填满一块或读到文件末尾
+      const want = Math.min(READ_CHUNK_SIZE, size - offset)
+      let filled = 0
+      while (filled < want) {
+        const { bytesRead } = await handle.read(buffer, filled, want - filled, offset + filled)
+        if (bytesRead === 0) break
+        filled += bytesRead
       }
+      if (filled === 0) break
+
+      const chunk = buffer.subarray(0, filled)
+      if (offset === 0 && !isTextBuffer(chunk)) {
+        return { isText: false, lineCount: 0 }
+      }
+      lineCount += countNewlines(chunk)
+      lastByte = chunk[filled - 1]
+      offset += filled
+
+      if (filled < want) break
+    }
+
+    // 末尾无换行的最后一行也计入
+    if (lastByte !== 0x0a) {
+      lineCount++
+    }
+    return { isText: true, lineCount }
+  } finally {
+    chunkPool.push(buffer)
+    await handle.close()
+  }
+}
+
+/**
+ * 读取文本文件：按 fstat 得到的大小一次分配缓冲区并整块读取，直接解码
+ * 省去 readFile 内部按 512KB 分段读取和拼接的开销
+ */
+async function readTextFile(filePath: string): Promise<string> {
+  const handle = await fs.promises.open(filePath, 'r')
+  try {
+    const { size } = await handle.stat()
+    const buffer = Buffer.allocUnsafe(size)
+    let length = 0
+    while (length < size) {
+      const { bytesRead } = await handle.read(buffer, length, size - length, length)
+      if (bytesRead === 0) break
+      length += bytesRead
     }
+    return buffer.toString('utf-8', 0, length)
+  } finally {
+    await handle.close()
   }
-  return false
 }
 
 /**
- * 简单的 glob 匹配函数
+ * 创建并发限制器：同一时刻最多运行 limit 个任务，其余排队
  */
-function minimatch(str: string, pattern: string): boolean {
-  // 转换 glob 模式为正则表达式
-  const regexPattern = pattern
+function createLimiter(limit: number): <T>(task: () => Promise<T>) => Promise<T> {
+  let active = 0
+  const queue: Array<() => void> = []
+
+  function next(): void {
+    active--
+    queue.shift()?.()
+  }
+
+  return <T>(task: () => Promise<T>): Promise<T> =>
+    new Promise<T>((resolve, reject) => {
+      const run = (): void => {
+        active++
+        task().then(resolve, reject).finally(next)
+      }
+      if (active < limit) {
+        run()
+      } else {
+        queue.push(run)
+      }
+    })
+}
+
+// 全进程共享的 I/O 并发池，分两条通道：
+// - limitFileIo：生成上下文、应用 diff、备份与回滚等交互操作的读写共用
+// - limitScanIo / limitDirIo：扫描一次性排入全部文件，单独排队，交互操作不会等在扫描积压之后
+// 每条通道各自受 IO_CONCURRENCY 限制，多次操作同时进行时不再各自新建并发池
+export const limitFileIo = createLimiter(IO_CONCURRENCY)
+const limitScanIo = createLimiter(IO_CONCURRENCY)
+const limitDirIo = createLimiter(IO_CONCURRENCY)
+
+interface ExcludeMatcher {
+  // 不含通配符的模式，直接按名称比较（小写）
+  names: Set<string>
+  // 含通配符的模式合并后的正则，没有时为 null
+  globRegex: RegExp | null
+}
+
+/**
+ * 将 glob 模式转换为正则表达式源码
+ */
+function globToRegexSource(pattern: string): string {
+  return pattern
     .replace(/\./g, '\\.')
     .replace(/\*/g, '.*')
     .replace(/\?/g, '.')
-  
-  const regex = new RegExp(`^${regexPattern}$`, 'i')
-  return regex.test(str)
+}
+
+/**
+ * 预处理排除模式：不含路径的字面量名称放入集合，其余模式一次性编译为单个正则
+ */
+function createExcludeMatcher(patterns: string[]): ExcludeMatcher {
+  const names = new Set<string>()
+  const globSources: string[] = []
+
+  for (const pattern of patterns) {
+    if (/[*?[]/.test(pattern)) {
+      globSources.push(globToRegexSource(pattern))
+    } else if (/[\\/]/.test(pattern)) {
+      // 含路径分隔符的字面量（如 src/gen）要与完整相对路径比较，并入正则
+      globSources.push(globToRegexSource(pattern.replace(/\\/g, '/')))
+    } else {
+      names.add(pattern.toLowerCase())
+    }
+  }
+
+  const globRegex = globSources.length > 0
+    ? new RegExp(`^(?:${globSources.join('|')})$`, 'i')
+    : null
+  return { names, globRegex }
+}
+
+// 默认排除模式在模块加载时编译一次；自定义模式缓存最近一次的编译结果
+const defaultExcludeMatcher = createExcludeMatcher(DEFAULT_EXCLUDE_PATTERNS)
+let lastCustomMatcher: { key: string; matcher: ExcludeMatcher } | null = null
+
+/**
+ * 获取排除模式的匹配器，模式不变时重复扫描不再重新编译
+ */
+function getExcludeMatcher(patterns: string[]): ExcludeMatcher {
+  if (patterns === DEFAULT_EXCLUDE_PATTERNS) {
+    return defaultExcludeMatcher
+  }
+
+  const key = patterns.join('\0')
+  if (!lastCustomMatcher || lastCustomMatcher.key !== key) {
+    lastCustomMatcher = { key, matcher: createExcludeMatcher(patterns) }
+  }
+  return lastCustomMatcher.matcher
+}
+
+/**
+ * 检查路径是否匹配 glob 排除模式
+ * 父目录在遍历时已经检查过，这里只需检查名称本身和完整路径
+ */
+function matchesExcludeGlob(name: string, relativePath: string, globRegex: RegExp | null): boolean {
+  if (!globRegex) {
+    return false
+  }
+  return globRegex.test(name) || globRegex.test(relativePath.replace(/\\/g, '/'))
 }
 
 /**
@@ -117,79 +323,144 @@ function minimatch(str: string, pattern: string): boolean {
 export async function scanDirectory(
   rootDir: string,
   excludePatterns: string[] = DEFAULT_EXCLUDE_PATTERNS,
-  maxFileSize: number = 1024 * 1024
+  maxFileSize: number = 1024 * 1024,
+  onBatch?: (files: FileInfo[]) => void,
+  signal?: AbortSignal
 ): Promise<ScanResult> {
   const files: FileInfo[] = []
+  let batchStart = 0
   let totalSize = 0
   let totalLines = 0
   const fileTypes: Record<string, number> = {}
+  const excludeMatcher = getExcludeMatcher(excludePatterns)
+  // 本次扫描遇到的分类结果，扫描完整结束后替换全局缓存
+  const seenClassifications = new Map<string, FileClassification>()
+
+  async function classifyFile(fullPath: string, relativePath: string, name: string): Promise<FileInfo | null> {
+    // 已取消时排队中的任务直接跳过
+    if (signal?.aborted) {
+      return null
+    }
+
+    try {
+      const stats = await fs.promises.stat(fullPath)
+
+      // 跳过过大的文件
+      if (stats.size > maxFileSize) {
+        return null
+      }
+
+      let cached = classificationCache.get(fullPath)
+      if (!cached || cached.size !== stats.size || cached.mtimeMs !== stats.mtimeMs) {
+        // 分块读取一次，同时完成文本检测和行数统计
+        const { isText, lineCount } = await classifyContent(fullPath, stats.size)
+        cached = {
+          size: stats.size,
+          mtimeMs: stats.mtimeMs,
+          isText,
+          lineCount
+        }
+        classificationCache.set(fullPath, cached)
+      }
+      seenClassifications.set(fullPath, cached)
+
+      if (!cached.isText) {
+        return null
+      }
+
+      const ext = getExtension(name)
+      const fileType = SUPPORTED_EXTENSIONS[ext] || 'Unknown'
+
+      totalLines += cached.lineCount
+
+      return {
+        path: fullPath,
+        relativePath,
+        name,
+        extension: ext,
+        size: stats.size,
+        sizeStr: getFileSizeStr(stats.size),
+        type: fileType,
+        isText: true,
+        lines: cached.lineCount
+      }
+    } catch {
+      // 忽略无法访问的文件
+      return null
+    }
+  }
+
+  function addFile(fileInfo: FileInfo | null): void {
+    if (!fileInfo) return
 
-  async function walkDir(dir: string): Promise<void> {
-    const entries = await fs.promises.readdir(dir, { withFileTypes: true })
+    files.push(fileInfo)
+    totalSize += fileInfo.size
+    fileTypes[fileInfo.extension] = (fileTypes[fileInfo.extension] || 0) + 1
+
+    if (onBatch && !signal?.aborted && files.length - batchStart >= SCAN_BATCH_SIZE) {
+      onBatch(files.slice(batchStart))
+      batchStart = files.length
+    }
+  }
+
+  // 目录遍历作为生产者，文件分类交给共享并发池，跨目录重叠 I/O；
+  // 各子目录并行遍历，readdir 另用一个并发池限制同时打开的目录数
+  const pending: Promise<void>[] = []
+
+  // 相对路径随递归逐级拼接，不再为每个条目调用 path.relative
+  async function walkDir(dir: string, relativeDir: string): Promise<void> {
+    if (signal?.aborted) return
+
+    let entries: fs.Dirent[]
+    try {
+      entries = await limitDirIo(() => fs.promises.readdir(dir, { withFileTypes: true }))
+    } catch (e) {
+      // 子目录无权限或扫描中被删除时跳过该目录，不让并行中的整个扫描失败；根目录读取失败仍然抛出
+      if (!relativeDir) throw e
+      return
+    }
+    const subDirs: Array<[string, string]> = []
 
     for (const entry of entries) {
+      // 先按名称快速剔除 node_modules、.git 等目录，无需构造路径
+      if (excludeMatcher.names.has(entry.name.toLowerCase())) {
+        continue
+      }
+
       const fullPath = path.join(dir, entry.name)
-      const relativePath = path.relative(rootDir, fullPath)
+      const relativePath = relativeDir ? relativeDir + path.sep + entry.name : entry.name
 
       // 检查是否匹配排除模式
-      if (matchesExcludePattern(relativePath, excludePatterns)) {
+      if (matchesExcludeGlob(entry.name, relativePath, excludeMatcher.globRegex)) {
         continue
       }
 
       if (entry.isDirectory()) {
-        await walkDir(fullPath)
+        subDirs.push([fullPath, relativePath])
       } else if (entry.isFile()) {
-        try {
-          const stats = await fs.promises.stat(fullPath)
-          
-          // 跳过过大的文件
-          if (stats.size > maxFileSize) {
-            continue
-          }
-
-          // 检查是否为文本文件
-          if (!isTextFile(fullPath)) {
-            continue
-          }
-
-          const ext = path.extname(entry.name).toLowerCase()
-          const fileType = SUPPORTED_EXTENSIONS[ext] || 'Unknown'
-
-          // 统计行数
-          let lineCount = 0
-          try {
-            const content = await fs.promises.readFile(fullPath, 'utf-8')
-            lineCount = content.split('\n').length
-            totalLines += lineCount
-          } catch {
-            // 忽略读取错误
-          }
-
-          const fileInfo: FileInfo = {
-            path: fullPath,
-            relativePath,
-            name: entry.name,
-            extension: ext,
-            size: stats.size,
-            sizeStr: getFileSizeStr(stats.size),
-            type: fileType,
-            isText: true
-          }
-
-          files.push(fileInfo)
-          totalSize += stats.size
-          fileTypes[ext] = (fileTypes[ext] || 0) + 1
-        } catch {
-          // 忽略无法访问的文件
-        }
+        const name = entry.name
+        pending.push(limitScanIo(() => classifyFile(fullPath, relativePath, name)).then(addFile))
       }
     }
+
+    await Promise.all(subDirs.map(([subDir, subRelative]) => walkDir(subDir, subRelative)))
   }
 
-  await walkDir(rootDir)
+  await walkDir(rootDir, '')
+  await Promise.all(pending)
+
+  // 只有完整结束的扫描才修剪缓存，取消的扫描可能漏掉大部分文件
+  if (!signal?.aborted) {
+    classificationCache = seenClassifications
+  }
 
-  // 按相对路径排序
-  files.sort((a, b) => a.relativePath.localeCompare(b.relativePath))
+  // 已取消的扫描不再推送剩余文件
+  if (onBatch && !signal?.aborted && files.length > batchStart) {
+    onBatch(files.slice(batchStart))
+  }
+
+  // 按相对路径排序（复用同一个 Collator，与 localeCompare 顺序一致）
+  files.sort((a, b) => pathCollator.compare(a.relativePath, b.relativePath))
 
   return {
     files,
@@ -208,30 +479,53 @@ export function buildTree(files: FileInfo[], rootDir: string): string {
     return '空项目\n'
   }
 
-  let tree = `项目: ${path.basename(rootDir)}\n`
-  const sortedPaths = files.map(f => f.relativePath).sort()
+  const out: string[] = [`项目: ${path.basename(rootDir)}\n`]
+  // 直接对文件对象排序，避免再按路径反查文件信息
+  const sortedFiles = [...files].sort((a, b) =>
+    a.relativePath < b.relativePath ? -1 : a.relativePath > b.relativePath ? 1 : 0
+  )
 
   let prevParts: string[] = []
-  for (const relPath of sortedPaths) {
-    const parts = relPath.split(path.sep)
-    for (let i = 0; i < parts.length; i++) {
+  for (const file of sortedFiles) {
+    const parts = file.relativePath.split(path.sep)
+
+    // 与上一个路径的公共前缀已经输出过，只输出其后的部分
+    let common = 0
+    while (common < prevParts.length && common < parts.length && prevParts[common] === parts[common]) {
+      common++
+    }
+
+    for (let i = common; i < parts.length; i++) {
       const part = parts[i]
       const prefix = '│   '.repeat(i) + '├── '
-      
-      if (prevParts.slice(0, i + 1).join('/') !== parts.slice(0, i + 1).join('/')) {
-        if (i === parts.length - 1) {
-          const file = files.find(f => f.relativePath === relPath)
-          const sizeStr = file ? file.sizeStr : ''
-          tree += `${prefix}${part} (${sizeStr})\n`
-        } else {
-          tree += `${prefix}${part}/\n`
-        }
+
+      if (i === parts.length - 1) {
+        out.push(`${prefix}${part} (${file.sizeStr})\n`)
+      } else {
+        out.push(`${prefix}${part}/\n`)
       }
     }
     prevParts = parts
   }
 
-  return tree
+  return out.join('')
+}
+
+/**
+ * 给内容逐行加上行号并追加到 parts
+ * 用 indexOf 查找换行，直接写出各行切片，不生成中间的行数组
+ */
+function appendNumberedLines(parts: string[], content: string): void {
+  let lineNo = 1
+  let start = 0
+  let end = content.indexOf('\n')
+  while (end !== -1) {
+    parts.push(`${String(lineNo).padStart(4)} | ${content.slice(start, end)}\n`)
+    lineNo++
+    start = end + 1
+    end = content.indexOf('\n', start)
+  }
+  parts.push(`${String(lineNo).padStart(4)} | ${content.slice(start)}`)
 }
 
 /**
@@ -247,35 +541,53 @@ export async function generateContext(
   }
 
   const treeStr = buildTree(files, rootDir)
-  let context = `=== 项目结构 ===\n${treeStr}\n=== 文件内容 (${files.length} 个文件) ===\n\n`
+  // 各段先收集到数组，最后一次性拼接，避免反复复制整个上下文
+  const parts: string[] = [
+    `=== 项目结构 ===\n${treeStr}\n=== 文件内容 (${files.length} 个文件) ===\n\n`
+  ]
+
+  // 所有读取立即排入并发池，按原始顺序逐个等待并拼接：
+  // 前面的文件在后续读取进行时就开始处理，处理完即释放原始内容
+  const reads: Array<Promise<{ ok: boolean; content: string }> | null> = files.map((file) =>
+    limitFileIo(async () => {
+      try {
+        return { ok: true, content: await readTextFile(file.path) }
+      } catch (e) {
+        return { ok: false, content: String(e) }
+      }
+    })
+  )
 
   for (let i = 0; i < files.length; i++) {
     const file = files[i]
-    try {
-      let content = await fs.promises.readFile(file.path, 'utf-8')
+    const pending = reads[i]
+    reads[i] = null
+    if (!pending) continue
+    const result = await pending
+
+    if (result.ok) {
+      const content = result.content
 
+      parts.push(`--- 文件 ${i + 1}: ${file.relativePath} ---\n`)
       if (includeLineNumbers && content.trim()) {
-        const lines = content.split('\n')
-        const numberedLines = lines.map((line, idx) => 
-          `${String(idx + 1).padStart(4)} | ${line}`
-        )
-        content = numberedLines.join('\n')
+        appendNumberedLines(parts, content)
+      } else {
+        parts.push(content)
       }
-
-      context += `--- 文件 ${i + 1}: ${file.relativePath} ---\n${content}\n--- 文件 ${i + 1} 结束 ---\n\n`
-    } catch (e) {
-      context += `--- 文件 ${i + 1}: ${file.relativePath} ---\n<读取失败: ${e}>\n--- 文件 ${i + 1} 结束 ---\n\n`
+      parts.push(`\n--- 文件 ${i + 1} 结束 ---\n\n`)
+    } else {
+      parts.push(`--- 文件 ${i + 1}: ${file.relativePath} ---\n<读取失败: ${result.content}>\n--- 文件 ${i + 1} 结束 ---\n\n`)
     }
   }
 
-  return context
+  return parts.join('')
 }
 
 /**
  * 读取文件内容
  */
 export async function readFileContent(filePath: string): Promise<string> {
-  return fs.promises.readFile(filePath, 'utf-8')
+  return readTextFile(filePath)
 }
 
 /**
@@ -0,0 +1,78 @@
+import * as fs from 'fs'
+import * as path from 'path'
+import { limitFileIo } from './fileScanner'
+
+/**
+ * 按回滚记录恢复文件：记录中已保存 相对路径 → 原始内容 的映射，各文件互不依赖，并行恢复
+ * diff:rollback 与 backup:rollback 共用
+ */
+export async function restoreRollbackRecord(rollbackId: string, projectRoot: string): Promise<{
+  success: boolean
+  restoredCount?: number
+  errors?: string[]
+  error?: string
+}> {
+  try {
+    // 校验 ID 安全性
+    if (!/^rollback_\d{8}-\d{6}$/.test(rollbackId)) {
+      return { success: false, error: '非法的回滚记录 ID' }
+    }
+
+    const filePath = path.join(projectRoot, '.diff_backups', `${rollbackId}.json`)
+
+    let recordContent: string
+    try {
+      recordContent = await fs.promises.readFile(filePath, 'utf-8')
+    } catch (e) {
+      if ((e as NodeJS.ErrnoException).code === 'ENOENT') {
+        return { success: false, error: '回滚记录不存在' }
+      }
+      throw e
+    }
+
+    const record = JSON.parse(recordContent)
+    const restoreEntries = Object.entries(record.files || {}) as Array<[string, string]>
+    const newFiles: string[] = record.newFiles || []
+
+    // 每项返回 null（无需处理）、true（已恢复）或错误信息，汇总时保持记录中的顺序
+    const results = await Promise.all([
+      // 恢复修改过的文件
+      ...restoreEntries.map(async ([relativePath, originalContent]): Promise<true | string> => {
+        try {
+          const targetPath = path.join(projectRoot, relativePath)
+          await limitFileIo(async () => {
+            await fs.promises.mkdir(path.dirname(targetPath), { recursive: true })
+            await fs.promises.writeFile(targetPath, originalContent, 'utf-8')
+          })
+          return true
+        } catch (e) {
+          return `${relativePath}: ${String(e)}`
+        }
+      }),
+      // 删除新创建的文件，已不存在的跳过
+      ...newFiles.map(async (relativePath): Promise<true | string | null> => {
+        try {
+          await limitFileIo(() => fs.promises.unlink(path.join(projectRoot, relativePath)))
+          return true
+        } catch (e) {
+          if ((e as NodeJS.ErrnoException).code === 'ENOENT') return null
+          return `删除 ${relativePath}: ${String(e)}`
+        }
+      })
+    ])
+
+    let restoredCount = 0
+    const errors: string[] = []
+    for (const r of results) {
+      if (r === true) {
+        restoredCount++
+      } else if (r !== null) {
+        errors.push(r)
+      }
+    }
+
+    return { success: errors.length === 0, restoredCount, errors }
+  } catch (error) {
+    return { success: false, error: String(error) }
+  }
+}
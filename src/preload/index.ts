@@ -3,18 +3,26 @@ import { electronAPI } from '@electron-toolkit/preload'
 
 // 文件操作 API
 const fileAPI = {
-  scan: (rootDir: string, options?: { excludePatterns?: string[]; maxFileSize?: number }) =>
+  scan: (rootDir: string, options?: { excludePatterns?: string[]; maxFileSize?: number; scanId?: number }) =>
     ipcRenderer.invoke('file:scan', rootDir, options),
   generateContext: (files: unknown[], rootDir: string, includeLineNumbers?: boolean) =>
     ipcRenderer.invoke('file:generateContext', files, rootDir, includeLineNumbers),
   getDefaultExcludePatterns: () => ipcRenderer.invoke('file:getDefaultExcludePatterns'),
-  getSupportedExtensions: () => ipcRenderer.invoke('file:getSupportedExtensions')
+  getSupportedExtensions: () => ipcRenderer.invoke('file:getSupportedExtensions'),
+  cancelScan: () => ipcRenderer.invoke('file:cancelScan'),
+  // 扫描批次事件监听，回调同时收到批次所属的扫描 ID
+  onScanBatch: (callback: (scanId: number, files: unknown[]) => void) => {
+    const handler = (_event: unknown, scanId: number, files: unknown[]) => callback(scanId, files)
+    ipcRenderer.on('file:scan-batch', handler)
+    return () => ipcRenderer.removeListener('file:scan-batch', handler)
+  }
 }
 
 // Diff 操作 API
 const diffAPI = {
   validate: (diffContent: string) => ipcRenderer.invoke('diff:validate', diffContent),
   parse: (diffContent: string) => ipcRenderer.invoke('diff:parse', diffContent),
+  prepare: (diffContent: string) => ipcRenderer.invoke('diff:prepare', diffContent),
   apply: (diffContent: string, projectRoot: string, options?: { createBackup?: boolean; dryRun?: boolean }) =>
     ipcRenderer.invoke('diff:apply', diffContent, projectRoot, options),
   checkConflicts: (diffContent: string, projectRoot: string) =>
@@ -12,6 +12,8 @@ const TABS = [
 
 export const App: React.FC = () => {
   const [activeTab, setActiveTab] = useState('project')
+  // 已访问过的标签页：首次切换到时才挂载，之后隐藏而不卸载，再次切回无需重建整个组件树
+  const [visitedTabs, setVisitedTabs] = useState<Set<string>>(() => new Set(['project']))
   const { loadConfig } = useSettingsStore()
 
   // 启动时加载配置
@@ -21,6 +23,7 @@ export const App: React.FC = () => {
 
   const goToTab = (tabId: string) => {
     setActiveTab(tabId)
+    setVisitedTabs((prev) => (prev.has(tabId) ? prev : new Set(prev).add(tabId)))
   }
 
   return (
@@ -41,21 +44,27 @@ export const App: React.FC = () => {
         <CyberTabs
           tabs={TABS}
           activeTab={activeTab}
-          onChange={setActiveTab}
+          onChange={goToTab}
         />
       </nav>
 
       {/* 主内容区域 */}
       <main className="flex-1 px-6 pb-6 min-h-0">
         <div className="h-full">
-          {activeTab === 'project' && (
-            <ProjectSetup onNext={() => goToTab('ai')} />
+          {visitedTabs.has('project') && (
+            <div className={activeTab === 'project' ? 'h-full' : 'hidden'}>
+              <ProjectSetup onNext={() => goToTab('ai')} />
+            </div>
           )}
-          {activeTab === 'ai' && (
-            <AIModify />
+          {visitedTabs.has('ai') && (
+            <div className={activeTab === 'ai' ? 'h-full' : 'hidden'}>
+              <AIModify />
+            </div>
           )}
-          {activeTab === 'settings' && (
-            <Settings />
+          {visitedTabs.has('settings') && (
+            <div className={activeTab === 'settings' ? 'h-full' : 'hidden'}>
+              <Settings />
+            </div>
           )}
         </div>
       </main>
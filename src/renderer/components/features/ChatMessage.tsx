@@ -4,6 +4,7 @@
  */
 
 import React from 'react'
+import { DiffLines } from './DiffLines'
 
 interface ChatMessageProps {
   role: 'user' | 'assistant' | 'system'
@@ -47,25 +48,11 @@ export const ChatMessage: React.FC<ChatMessageProps> = ({
             <div className="bg-neon-cyan/10 px-3 py-1 text-xs text-neon-cyan font-mono">
               DIFF
             </div>
-            <pre className="bg-deep-space/80 p-3 text-sm font-mono overflow-x-auto">
-              {code.split('\n').map((line, i) => {
-                let className = 'text-ghost-white'
-                if (line.startsWith('+') && !line.startsWith('+++')) {
-                  className = 'text-success-green bg-success-green/10'
-                } else if (line.startsWith('-') && !line.startsWith('---')) {
-                  className = 'text-error-red bg-error-red/10'
-                } else if (line.startsWith('@@')) {
-                  className = 'text-neon-cyan'
-                } else if (line.startsWith('---') || line.startsWith('+++')) {
-                  className = 'text-warning-yellow'
-                }
-                return (
-                  <div key={i} className={className}>
-                    {line}
-                  </div>
-                )
-              })}
-            </pre>
+            <DiffLines
+              diff={code}
+              bgOpacity={10}
+              className="bg-deep-space/80 p-3 text-sm font-mono overflow-x-auto"
+            />
           </div>
         )
       } else {
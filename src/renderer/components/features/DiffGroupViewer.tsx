@@ -5,6 +5,7 @@
 
 import React, { useState, useMemo } from 'react'
 import { CyberButton } from '../ui'
+import { DiffLines } from './DiffLines'
 
 interface DiffGroupViewerProps {
   diffContent: string
@@ -19,9 +20,17 @@ interface DiffGroupViewerProps {
 function splitDiffByFile(diffContent: string): Array<{ filePath: string; diff: string; stats: { additions: number; deletions: number } }> {
   const files: Array<{ filePath: string; diff: string; stats: { additions: number; deletions: number } }> = []
 
-  // 按 "--- " 分割文件
+  // 按 "--- " 分割文件，增删行数在同一次遍历中按首字符统计
   const lines = diffContent.split('\n')
-  let currentFile: { path: string; lines: string[] } | null = null
+  let currentFile: { path: string; lines: string[]; additions: number; deletions: number } | null = null
+
+  const pushCurrentFile = (file: { path: string; lines: string[]; additions: number; deletions: number }) => {
+    files.push({
+      filePath: file.path,
+      diff: file.lines.join('\n'),
+      stats: { additions: file.additions, deletions: file.deletions }
+    })
+  }
 
   for (let i = 0; i < lines.length; i++) {
     const line = lines[i]
@@ -29,14 +38,7 @@ function splitDiffByFile(diffContent: string): Array<{ filePath: string; diff: s
     if (line.startsWith('--- ')) {
       // 保存前一个文件
       if (currentFile) {
-        const diff = currentFile.lines.join('\n')
-        const additions = currentFile.lines.filter(l => l.startsWith('+') && !l.startsWith('+++')).length
-        const deletions = currentFile.lines.filter(l => l.startsWith('-') && !l.startsWith('---')).length
-        files.push({
-          filePath: currentFile.path,
-          diff,
-          stats: { additions, deletions }
-        })
+        pushCurrentFile(currentFile)
       }
 
       // 解析新文件路径
@@ -52,22 +54,23 @@ function splitDiffByFile(diffContent: string): Array<{ filePath: string; diff: s
         if (newPath !== '/dev/null') filePath = newPath
       }
 
-      currentFile = { path: filePath, lines: [line] }
+      currentFile = { path: filePath, lines: [line], additions: 0, deletions: 0 }
     } else if (currentFile) {
       currentFile.lines.push(line)
+
+      // +++ / --- 开头的文件头不计入
+      const first = line[0]
+      if (first === '+') {
+        if (!line.startsWith('+++')) currentFile.additions++
+      } else if (first === '-') {
+        if (!line.startsWith('---')) currentFile.deletions++
+      }
     }
   }
 
   // 保存最后一个文件
   if (currentFile) {
-    const diff = currentFile.lines.join('\n')
-    const additions = currentFile.lines.filter(l => l.startsWith('+') && !l.startsWith('+++')).length
-    const deletions = currentFile.lines.filter(l => l.startsWith('-') && !l.startsWith('---')).length
-    files.push({
-      filePath: currentFile.path,
-      diff,
-      stats: { additions, deletions }
-    })
+    pushCurrentFile(currentFile)
   }
 
   return files
@@ -177,25 +180,11 @@ export const DiffGroupViewer: React.FC<DiffGroupViewerProps> = ({
 
             {/* Diff 内容 */}
             {isExpanded && (
-              <pre className="bg-deep-space/60 p-3 text-sm font-mono overflow-x-auto max-h-96 overflow-y-auto">
-                {file.diff.split('\n').map((line, i) => {
-                  let className = 'text-ghost-white'
-                  if (line.startsWith('+') && !line.startsWith('+++')) {
-                    className = 'text-success-green bg-success-green/5'
-                  } else if (line.startsWith('-') && !line.startsWith('---')) {
-                    className = 'text-error-red bg-error-red/5'
-                  } else if (line.startsWith('@@')) {
-                    className = 'text-neon-cyan'
-                  } else if (line.startsWith('---') || line.startsWith('+++')) {
-                    className = 'text-warning-yellow'
-                  }
-                  return (
-                    <div key={i} className={className}>
-                      {line}
-                    </div>
-                  )
-                })}
-              </pre>
+              <DiffLines
+                diff={file.diff}
+                bgOpacity={5}
+                className="bg-deep-space/60 p-3 text-sm font-mono overflow-x-auto max-h-96 overflow-y-auto"
+              />
             )}
           </div>
         )
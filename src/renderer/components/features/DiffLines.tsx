@@ -0,0 +1,79 @@
+/**
+ * 分批挂载的 diff 行列表
+ * 连续同样式的行合并为一段，整段只渲染一个节点；大 diff 分批挂载，批次之间让出主线程
+ */
+
+import React, { useEffect, useMemo, useState } from 'react'
+import { getDiffLineClassName } from '../../utils/diffLineStyles'
+
+// 每批渲染的行数上限：超过的同类型长段会被切开，保证单批不超过该行数
+export const RENDER_BATCH_LINES = 500
+
+/**
+ * 从 start 段开始累计不超过 RENDER_BATCH_LINES 行，返回该批结束位置（不含）
+ * 每段已不超过批大小，因此每批至少包含一段
+ */
+function nextBatchEnd(runs: Array<{ lines: string[] }>, start: number): number {
+  let end = start
+  let lines = 0
+  while (end < runs.length) {
+    const length = runs[end].lines.length
+    if (end > start && lines + length > RENDER_BATCH_LINES) break
+    lines += length
+    end++
+  }
+  return end
+}
+
+/**
+ * 返回当前应渲染的段数：首批随组件同步渲染，其余批次依次追加，先显示的部分可以立即滚动查看
+ * runs 变化（如流式输出追加内容）时已显示的段数不回退
+ */
+export function useBatchedRunCount(runs: Array<{ lines: string[] }>): number {
+  const [count, setCount] = useState(0)
+  const visibleCount = Math.min(runs.length, Math.max(count, nextBatchEnd(runs, 0)))
+
+  useEffect(() => {
+    if (visibleCount >= runs.length) return
+    const timer = setTimeout(() => setCount(nextBatchEnd(runs, visibleCount)), 0)
+    return () => clearTimeout(timer)
+  }, [runs, visibleCount])
+
+  return visibleCount
+}
+
+interface DiffLinesProps {
+  diff: string
+  // 增删行背景的不透明度
+  bgOpacity: 5 | 10
+  className?: string
+}
+
+export const DiffLines = React.memo<DiffLinesProps>(({ diff, bgOpacity, className }) => {
+  const runs = useMemo(() => {
+    const result: Array<{ className: string; lines: string[] }> = []
+    let current: { className: string; lines: string[] } | null = null
+
+    for (const line of diff.split('\n')) {
+      const lineClassName = getDiffLineClassName(line, bgOpacity)
+      if (!current || current.className !== lineClassName || current.lines.length >= RENDER_BATCH_LINES) {
+        current = { className: lineClassName, lines: [] }
+        result.push(current)
+      }
+      current.lines.push(line)
+    }
+    return result
+  }, [diff, bgOpacity])
+
+  const visibleCount = useBatchedRunCount(runs)
+
+  return (
+    <pre className={className}>
+      {runs.slice(0, visibleCount).map((run, i) => (
+        <div key={i} className={run.className}>
+          {run.lines.join('\n')}
+        </div>
+      ))}
+    </pre>
+  )
+})
@@ -1,21 +1,44 @@
 import React, { useMemo } from 'react'
 import { cn } from '../../utils/cn'
+import { RENDER_BATCH_LINES, useBatchedRunCount } from './DiffLines'
 
 interface DiffViewerProps {
   content: string
   className?: string
 }
 
+type LineType = 'add' | 'delete' | 'header' | 'hunk' | 'context'
+
+// 连续同类型的行合并为一段，整段只渲染一次
+interface LineRun {
+  type: LineType
+  startNumber: number
+  lines: string[]
+}
+
 export const DiffViewer: React.FC<DiffViewerProps> = ({ content, className }) => {
-  const lines = useMemo(() => {
+  const runs = useMemo(() => {
     if (!content) return []
-    return content.split('\n').map((line, index) => ({
-      number: index + 1,
-      content: line,
-      type: getLineType(line)
-    }))
+
+    const result: LineRun[] = []
+    let current: LineRun | null = null
+    const lines = content.split('\n')
+
+    for (let i = 0; i < lines.length; i++) {
+      const type = getLineType(lines[i])
+      // 同类型的长段按批大小切开，保证单批不超过 RENDER_BATCH_LINES 行
+      if (!current || current.type !== type || current.lines.length >= RENDER_BATCH_LINES) {
+        current = { type, startNumber: i + 1, lines: [] }
+        result.push(current)
+      }
+      current.lines.push(lines[i])
+    }
+    return result
   }, [content])
 
+  // 首批同步渲染，其余批次依次追加
+  const visibleCount = useBatchedRunCount(runs)
+
   if (!content) {
     return (
       <div className={cn('flex items-center justify-center h-full text-cyber-gray', className)}>
@@ -26,30 +49,30 @@ export const DiffViewer: React.FC<DiffViewerProps> = ({ content, className }) =>
 
   return (
     <div className={cn('font-mono text-sm overflow-auto bg-deep-space rounded-lg', className)}>
-      {lines.map((line) => (
+      {runs.slice(0, visibleCount).map((run) => (
         <div
-          key={line.number}
+          key={run.startNumber}
           className={cn(
-            'flex',
-            line.type === 'add' && 'bg-success-green/10',
-            line.type === 'delete' && 'bg-error-red/10',
-            line.type === 'hunk' && 'bg-neon-purple/10'
+            'flex leading-6',
+            run.type === 'add' && 'bg-success-green/10',
+            run.type === 'delete' && 'bg-error-red/10',
+            run.type === 'hunk' && 'bg-neon-purple/10'
           )}
         >
-          <span className="w-12 flex-shrink-0 text-right pr-3 py-0.5 text-cyber-gray select-none border-r border-shadow-gray">
-            {line.number}
-          </span>
+          <pre className="w-12 flex-shrink-0 text-right pr-3 text-cyber-gray select-none border-r border-shadow-gray">
+            {run.lines.map((_, i) => run.startNumber + i).join('\n')}
+          </pre>
           <pre
             className={cn(
-              'flex-1 px-3 py-0.5 whitespace-pre overflow-x-auto',
-              line.type === 'add' && 'text-success-green',
-              line.type === 'delete' && 'text-error-red',
-              line.type === 'header' && 'text-neon-cyan font-bold',
-              line.type === 'hunk' && 'text-neon-purple',
-              line.type === 'context' && 'text-cyber-gray'
+              'flex-1 px-3 whitespace-pre overflow-x-auto',
+              run.type === 'add' && 'text-success-green',
+              run.type === 'delete' && 'text-error-red',
+              run.type === 'header' && 'text-neon-cyan font-bold',
+              run.type === 'hunk' && 'text-neon-purple',
+              run.type === 'context' && 'text-cyber-gray'
             )}
           >
-            {line.content}
+            {run.lines.join('\n')}
           </pre>
         </div>
       ))}
@@ -57,18 +80,17 @@ export const DiffViewer: React.FC<DiffViewerProps> = ({ content, className }) =>
   )
 }
 
-function getLineType(line: string): 'add' | 'delete' | 'header' | 'hunk' | 'context' {
-  if (line.startsWith('+++') || line.startsWith('---')) {
-    return 'header'
-  }
-  if (line.startsWith('@@')) {
-    return 'hunk'
-  }
-  if (line.startsWith('+')) {
-    return 'add'
+function getLineType(line: string): LineType {
+  // 按首字符分派，只有 +/- 开头时才检查三字符的文件头
+  switch (line[0]) {
+    case '+':
+      return line.startsWith('+++') ? 'header' : 'add'
+    case '-':
+      return line.startsWith('---') ? 'header' : 'delete'
+    case '@':
+      return line[1] === '@' ? 'hunk' : 'context'
+    default:
+      return 'context'
   }
-  if (line.startsWith('-')) {
-    return 'delete'
-  }
-  return 'context'
 }
+
@@ -1,39 +1,92 @@
-import React, { useMemo, useState } from 'react'
+import React, { useEffect, useMemo, useRef, useState } from 'react'
+import { useShallow } from 'zustand/react/shallow'
 import { useProjectStore, FileInfo } from '../../stores/projectStore'
 import { CyberButton, CyberInput, CyberCheckbox } from '../ui'
 import { cn } from '../../utils/cn'
 
+// 虚拟列表：固定行高，只渲染可视区域内的行
+const ROW_HEIGHT = 32
+const OVERSCAN = 10
+// 过滤输入防抖（毫秒）
+const FILTER_DEBOUNCE_MS = 150
+
 interface FileTreeProps {
   className?: string
 }
 
 export const FileTree: React.FC<FileTreeProps> = ({ className }) => {
+  // 只订阅需要的字段，扫描进度等变化不会触发文件列表重渲染
   const { 
     scanResult, 
-    selectedFiles, 
+    selection, 
+    selectedCount,
     toggleFileSelection,
     selectAllFiles,
     deselectAllFiles,
     invertSelection
-  } = useProjectStore()
+  } = useProjectStore(useShallow((state) => ({
+    scanResult: state.scanResult,
+    selection: state.selection,
+    selectedCount: state.selectedCount,
+    toggleFileSelection: state.toggleFileSelection,
+    selectAllFiles: state.selectAllFiles,
+    deselectAllFiles: state.deselectAllFiles,
+    invertSelection: state.invertSelection
+  })))
   
+  const [filterInput, setFilterInput] = useState('')
   const [filter, setFilter] = useState('')
+  const listRef = useRef<HTMLDivElement>(null)
+  const [scrollTop, setScrollTop] = useState(0)
+  const [viewportHeight, setViewportHeight] = useState(0)
+  const hasScanResult = !!scanResult
+
+  // 跟踪列表可视区域高度
+  useEffect(() => {
+    const el = listRef.current
+    if (!el) return
+
+    setViewportHeight(el.clientHeight)
+    const observer = new ResizeObserver(() => setViewportHeight(el.clientHeight))
+    observer.observe(el)
+    return () => observer.disconnect()
+  }, [hasScanResult])
+
+  // 连续输入时只在停顿后执行一次过滤
+  useEffect(() => {
+    const timer = setTimeout(() => setFilter(filterInput), FILTER_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [filterInput])
 
-  const filteredFiles = useMemo(() => {
+  // 每次扫描只计算一次小写检索键（文件名已包含在相对路径中）
+  const searchKeys = useMemo(() => {
     if (!scanResult) return []
-    if (!filter) return scanResult.files
-    
+    return scanResult.files.map(f => `${f.relativePath}\n${f.type}`.toLowerCase())
+  }, [scanResult])
+
+  // 过滤结果保存为文件下标，便于直接读取选中位图
+  const filteredIndices = useMemo(() => {
+    if (!scanResult) return []
+
+    const indices: number[] = []
     const lowerFilter = filter.toLowerCase()
-    return scanResult.files.filter(f => 
-      f.relativePath.toLowerCase().includes(lowerFilter) ||
-      f.name.toLowerCase().includes(lowerFilter) ||
-      f.type.toLowerCase().includes(lowerFilter)
-    )
-  }, [scanResult, filter])
+    for (let i = 0; i < searchKeys.length; i++) {
+      if (!lowerFilter || searchKeys[i].includes(lowerFilter)) {
+        indices.push(i)
+      }
+    }
+    return indices
+  }, [scanResult, searchKeys, filter])
 
-  const selectedCount = selectedFiles.size
   const totalCount = scanResult?.files.length || 0
 
+  const startIndex = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN)
+  const endIndex = Math.min(
+    filteredIndices.length,
+    Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN
+  )
+  const visibleIndices = filteredIndices.slice(startIndex, endIndex)
+
   if (!scanResult) {
     return (
       <div className={cn('flex items-center justify-center h-full text-cyber-gray', className)}>
@@ -48,8 +101,8 @@ export const FileTree: React.FC<FileTreeProps> = ({ className }) => {
       <div className="flex-shrink-0 space-y-2 mb-3">
         <CyberInput
           placeholder="输入关键词过滤文件..."
-          value={filter}
-          onChange={(e) => setFilter(e.target.value)}
+          value={filterInput}
+          onChange={(e) => setFilterInput(e.target.value)}
           icon={
             <svg className="w-4 h-4" fill="none" viewBox="0 0 24 24" stroke="currentColor">
               <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M21 21l-6-6m2-5a7 7 0 11-14 0 7 7 0 0114 0z" />
@@ -74,17 +127,26 @@ export const FileTree: React.FC<FileTreeProps> = ({ className }) => {
       </div>
 
       {/* 文件列表 */}
-      <div className="flex-1 overflow-auto">
-        {filteredFiles.map((file) => (
-          <FileTreeItem
-            key={file.path}
-            file={file}
-            selected={selectedFiles.has(file.path)}
-            onToggle={() => toggleFileSelection(file.path)}
-          />
-        ))}
-        
-        {filteredFiles.length === 0 && (
+      <div
+        ref={listRef}
+        className="flex-1 overflow-auto"
+        onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+      >
+        <div className="relative" style={{ height: filteredIndices.length * ROW_HEIGHT }}>
+          <div style={{ transform: `translateY(${startIndex * ROW_HEIGHT}px)` }}>
+            {visibleIndices.map((index) => (
+              <FileTreeItem
+                key={scanResult.files[index].path}
+                index={index}
+                file={scanResult.files[index]}
+                selected={selection[index] === 1}
+                onToggle={toggleFileSelection}
+              />
+            ))}
+          </div>
+        </div>
+
+        {filteredIndices.length === 0 && (
           <div className="text-center text-cyber-gray py-8">
             没有匹配的文件
           </div>
@@ -95,27 +157,31 @@ export const FileTree: React.FC<FileTreeProps> = ({ className }) => {
 }
 
 interface FileTreeItemProps {
+  index: number
   file: FileInfo
   selected: boolean
-  onToggle: () => void
+  onToggle: (index: number) => void
 }
 
-const FileTreeItem: React.FC<FileTreeItemProps> = ({ file, selected, onToggle }) => {
+// 回调直接使用 store 中稳定的 toggleFileSelection，滚动或切换其他行时
+// 属性不变的行不会重新渲染
+const FileTreeItem = React.memo<FileTreeItemProps>(({ index, file, selected, onToggle }) => {
   const indent = file.relativePath.split(/[/\\]/).length - 1
+  const handleToggle = (): void => onToggle(index)
 
   return (
     <div
       className={cn(
-        'flex items-center gap-2 px-2 py-1.5 rounded cursor-pointer transition-colors',
+        'flex items-center gap-2 px-2 rounded cursor-pointer transition-colors',
         'hover:bg-neon-cyan/10',
         selected && 'bg-neon-cyan/5'
       )}
-      style={{ paddingLeft: `${8 + indent * 16}px` }}
-      onClick={onToggle}
+      style={{ height: ROW_HEIGHT, paddingLeft: `${8 + indent * 16}px` }}
+      onClick={handleToggle}
     >
       <CyberCheckbox
         checked={selected}
-        onChange={onToggle}
+        onChange={handleToggle}
       />
       
       <span className="flex-1 text-sm text-ghost-white truncate">
@@ -131,4 +197,4 @@ const FileTreeItem: React.FC<FileTreeItemProps> = ({ file, selected, onToggle })
       </span>
     </div>
   )
-}
+})
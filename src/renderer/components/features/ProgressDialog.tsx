@@ -1,5 +1,5 @@
 import React from 'react'
-import { CyberProgress } from '../ui'
+import { CyberProgress, CyberButton } from '../ui'
 import { cn } from '../../utils/cn'
 
 interface ProgressDialogProps {
@@ -7,6 +7,7 @@ interface ProgressDialogProps {
   title: string
   message: string
   progress: number
+  onCancel?: () => void
   className?: string
 }
 
@@ -15,6 +16,7 @@ export const ProgressDialog: React.FC<ProgressDialogProps> = ({
   title,
   message,
   progress,
+  onCancel,
   className
 }) => {
   if (!isOpen) return null
@@ -37,6 +39,14 @@ export const ProgressDialog: React.FC<ProgressDialogProps> = ({
         <p className="text-ghost-white mb-4">{message}</p>
         
         <CyberProgress value={progress} showLabel />
+
+        {onCancel && (
+          <div className="flex justify-end mt-4">
+            <CyberButton size="sm" variant="ghost" onClick={onCancel}>
+              取消
+            </CyberButton>
+          </div>
+        )}
         
         {/* 装饰性角落 */}
         <div className="absolute top-0 left-0 w-4 h-4 border-t-2 border-l-2 border-neon-cyan" />
@@ -1,4 +1,5 @@
-import React from 'react'
+import React, { useMemo } from 'react'
+import { useShallow } from 'zustand/react/shallow'
 import { useProjectStore } from '../../stores/projectStore'
 import { CyberCard } from '../ui'
 import { cn } from '../../utils/cn'
@@ -8,7 +9,33 @@ interface StatsPanelProps {
 }
 
 export const StatsPanel: React.FC<StatsPanelProps> = ({ className }) => {
-  const { scanResult, selectedFiles } = useProjectStore()
+  const { scanResult, selection } = useProjectStore(useShallow((state) => ({
+    scanResult: state.scanResult,
+    selection: state.selection
+  })))
+
+  // 选中文件的统计只在扫描结果或选择变化时重新计算，单次遍历完成
+  const { fileCount, totalSize, totalLines, typeCount, sortedTypes } = useMemo(() => {
+    const fileTypes: Record<string, number> = {}
+    let fileCount = 0
+    let totalSize = 0
+    let totalLines = 0
+
+    if (scanResult) {
+      const files = scanResult.files
+      for (let i = 0; i < files.length; i++) {
+        if (selection[i] !== 1) continue
+        fileCount++
+        totalSize += files[i].size
+        totalLines += files[i].lines
+        fileTypes[files[i].extension] = (fileTypes[files[i].extension] || 0) + 1
+      }
+    }
+
+    const sortedTypes = topEntries(fileTypes, 10)
+
+    return { fileCount, totalSize, totalLines, typeCount: Object.keys(fileTypes).length, sortedTypes }
+  }, [scanResult, selection])
 
   if (!scanResult) {
     return (
@@ -20,35 +47,15 @@ export const StatsPanel: React.FC<StatsPanelProps> = ({ className }) => {
     )
   }
 
-  // 计算选中文件的统计
-  const selectedFilesData = scanResult.files.filter(f => selectedFiles.has(f.path))
-  const totalSize = selectedFilesData.reduce((sum, f) => sum + f.size, 0)
-  
-  // 统计文件类型
-  const fileTypes: Record<string, number> = {}
-  selectedFilesData.forEach(f => {
-    fileTypes[f.extension] = (fileTypes[f.extension] || 0) + 1
-  })
-  
-  const sortedTypes = Object.entries(fileTypes)
-    .sort((a, b) => b[1] - a[1])
-    .slice(0, 10)
-
-  const formatSize = (bytes: number): string => {
-    if (bytes < 1024) return `${bytes} B`
-    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`
-    return `${(bytes / (1024 * 1024)).toFixed(1)} MB`
-  }
-
   return (
     <CyberCard className={cn('h-full', className)} title="项目统计">
       <div className="space-y-4">
         {/* 基础统计 */}
         <div className="grid grid-cols-2 gap-3">
-          <StatItem label="文件总数" value={selectedFilesData.length.toString()} />
+          <StatItem label="文件总数" value={fileCount.toString()} />
           <StatItem label="总大小" value={formatSize(totalSize)} />
-          <StatItem label="代码行数" value={scanResult.totalLines.toLocaleString()} />
-          <StatItem label="文件类型" value={Object.keys(fileTypes).length.toString()} />
+          <StatItem label="代码行数" value={totalLines.toLocaleString()} />
+          <StatItem label="文件类型" value={typeCount.toString()} />
         </div>
 
         {/* 文件类型分布 */}
@@ -70,6 +77,32 @@ export const StatsPanel: React.FC<StatsPanelProps> = ({ className }) => {
   )
 }
 
+/**
+ * 取数量最多的前 limit 项，只维护一个长度为 limit 的有序数组，不对全部类型排序
+ * 数量相同时保持原有顺序，与稳定排序后截取的结果一致
+ */
+function topEntries(counts: Record<string, number>, limit: number): Array<[string, number]> {
+  const top: Array<[string, number]> = []
+
+  for (const key in counts) {
+    const count = counts[key]
+    if (top.length === limit && count <= top[limit - 1][1]) continue
+
+    let pos = top.length
+    while (pos > 0 && top[pos - 1][1] < count) pos--
+    top.splice(pos, 0, [key, count])
+    if (top.length > limit) top.pop()
+  }
+
+  return top
+}
+
+function formatSize(bytes: number): string {
+  if (bytes < 1024) return `${bytes} B`
+  if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`
+  return `${(bytes / (1024 * 1024)).toFixed(1)} MB`
+}
+
 interface StatItemProps {
   label: string
   value: string
@@ -12,7 +12,9 @@ import { CyberButton, CyberCard } from '../components/ui'
 import { ChatMessage, ChatInput, DiffGroupViewer, ConversationList } from '../components/features'
 
 export const AIModify: React.FC = () => {
-  const { projectRoot, scanResult, selectedFiles, context } = useProjectStore()
+  // 只订阅用到的字段：页面隐藏时仍保持挂载，扫描进度、文件批次和勾选变化不应触发整页重渲染
+  const projectRoot = useProjectStore((state) => state.projectRoot)
+  const context = useProjectStore((state) => state.context)
   const { config, getActiveProvider } = useSettingsStore()
   const {
     currentConversation,
@@ -169,13 +171,20 @@ ${messageContent}`
       return
     }
 
-    const validation = await (window as any).api.diff.validate(diffToApply)
+    // 验证并解析一次往返完成，随后的 apply 命中主进程对同一内容的缓存
+    const prepared = await (window as any).api.diff.prepare(diffToApply)
+    if (!prepared.success) {
+      alert(`Diff 解析失败: ${prepared.error}`)
+      return
+    }
+
+    const validation = prepared.validation
     if (!validation.isValid) {
       alert(`Diff 格式验证失败:\n${validation.message}`)
       return
     }
 
-    if (!confirm('确定要应用此修改？（将自动创建备份）')) return
+    if (!confirm(`确定要应用此修改？共 ${prepared.data.length} 个文件（将自动创建备份）`)) return
 
     try {
       const result = await (window as any).api.diff.apply(diffToApply, projectRoot, {
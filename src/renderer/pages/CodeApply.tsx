@@ -1,6 +1,6 @@
 import React from 'react'
 import { useProjectStore } from '../stores/projectStore'
-import { useDiffStore } from '../stores/diffStore'
+import { useDiffStore, FileChange } from '../stores/diffStore'
 import { CyberButton, CyberCard, CyberCheckbox } from '../components/ui'
 import { ProgressDialog } from '../components/features'
 
@@ -32,8 +32,14 @@ export const CodeApply: React.FC = () => {
       return
     }
 
-    // 验证 diff
-    const validation = await window.api.diff.validate(diffContent)
+    // 验证并解析 diff（一次 IPC 往返）
+    const parseResult = await window.api.diff.prepare(diffContent)
+    if (!parseResult.success) {
+      alert('无法解析Diff内容或没有发现文件修改')
+      return
+    }
+
+    const validation = parseResult.validation
     if (!validation.isValid) {
       alert(`Diff格式验证失败:\n${validation.message}`)
       return
@@ -44,27 +50,30 @@ export const CodeApply: React.FC = () => {
       if (!proceed) return
     }
 
-    // 解析 diff
-    const parseResult = await window.api.diff.parse(diffContent)
-    if (!parseResult.success || !parseResult.data || parseResult.data.length === 0) {
+    if (!parseResult.data || parseResult.data.length === 0) {
       alert('无法解析Diff内容或没有发现文件修改')
       return
     }
 
-    const fileChanges = parseResult.data
-    const affectedFiles = fileChanges.map((c: any) => c.newPath)
-
-    // 确认对话框
-    let confirmMsg = `即将修改以下 ${affectedFiles.length} 个文件:\n\n`
-    confirmMsg += affectedFiles.slice(0, 10).map((p: string) => `• ${p}`).join('\n')
-    if (affectedFiles.length > 10) {
-      confirmMsg += `\n... 还有 ${affectedFiles.length - 10} 个文件`
+    const fileChanges: FileChange[] = parseResult.data
+    const fileCount = fileChanges.length
+
+    // 确认对话框：只取前 10 个文件名，各段收集后一次性拼接
+    const head10 = fileChanges.slice(0, 10)
+    const confirmParts: string[] = [
+      `即将修改以下 ${fileCount} 个文件:\n\n`,
+      head10.map((c) => `• ${c.newPath}`).join('\n')
+    ]
+    if (fileCount > 10) {
+      confirmParts.push(`\n... 还有 ${fileCount - 10} 个文件`)
     }
-    confirmMsg += `\n\n备份: ${createBackup ? '是' : '否'}`
-    confirmMsg += `\n预览模式: ${dryRun ? '是' : '否'}`
-    confirmMsg += '\n\n确定要继续吗？'
+    confirmParts.push(
+      `\n\n备份: ${createBackup ? '是' : '否'}`,
+      `\n预览模式: ${dryRun ? '是' : '否'}`,
+      '\n\n确定要继续吗？'
+    )
 
-    if (!confirm(confirmMsg)) return
+    if (!confirm(confirmParts.join(''))) return
 
     // 执行应用
     setIsApplying(true)
@@ -109,23 +118,22 @@ export const CodeApply: React.FC = () => {
         return
       }
 
-      const fileChanges = result.data
-      let previewContent = `将要修改的文件 (${fileChanges.length} 个):\n\n`
+      const fileChanges: FileChange[] = result.data
+      // 各段收集到数组，最后一次性拼接
+      const parts: string[] = [`将要修改的文件 (${fileChanges.length} 个):\n\n`]
 
-      fileChanges.forEach((change: any, i: number) => {
-        previewContent += `${i + 1}. ${change.newPath}\n`
-        previewContent += `   修改块数: ${change.hunks.length}\n`
+      fileChanges.forEach((change, i) => {
+        parts.push(`${i + 1}. ${change.newPath}\n`, `   修改块数: ${change.hunks.length}\n`)
 
-        change.hunks.forEach((hunk: any, j: number) => {
-          const additions = hunk.lines.filter((l: string) => l.startsWith('+')).length
-          const deletions = hunk.lines.filter((l: string) => l.startsWith('-')).length
-          previewContent += `   块 ${j + 1}: +${additions} -${deletions} 行\n`
+        // 增删行数已在解析时统计
+        change.hunks.forEach((hunk, j) => {
+          parts.push(`   块 ${j + 1}: +${hunk.additions} -${hunk.deletions} 行\n`)
         })
 
-        previewContent += '\n'
+        parts.push('\n')
       })
 
-      alert(previewContent)
+      alert(parts.join(''))
     } catch (error) {
       alert(`预览失败: ${error}`)
     }
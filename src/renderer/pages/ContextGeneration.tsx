@@ -1,4 +1,4 @@
-import React, { useState } from 'react'
+import React, { useState, useRef } from 'react'
 import { useProjectStore } from '../stores/projectStore'
 import { CyberButton, CyberInput, CyberTextarea, CyberCard } from '../components/ui'
 
@@ -10,6 +10,8 @@ export const ContextGeneration: React.FC<ContextGenerationProps> = ({ onNext })
   const { context } = useProjectStore()
   const [prompt, setPrompt] = useState('')
   const [fullPrompt, setFullPrompt] = useState('')
+  // 上下文和指令都没变时直接复用上次拼好的提示，避免重复拼接大字符串
+  const promptCacheRef = useRef<{ context: string; prompt: string; result: string } | null>(null)
 
   const handleGeneratePrompt = () => {
     if (!context) {
@@ -22,6 +24,13 @@ export const ContextGeneration: React.FC<ContextGenerationProps> = ({ onNext })
       return
     }
 
+    const cached = promptCacheRef.current
+    if (cached && cached.context === context && cached.prompt === prompt) {
+      // 内容相同时 React 会跳过重渲染
+      setFullPrompt(cached.result)
+      return
+    }
+
     const generated = `请根据以下项目上下文和指令，生成代码修改的diff格式输出：
 
 ${context}
@@ -37,6 +46,7 @@ ${prompt}
 
 请生成diff格式的修改建议：`
 
+    promptCacheRef.current = { context, prompt, result: generated }
     setFullPrompt(generated)
   }
 
@@ -1,4 +1,5 @@
-import React, { useState } from 'react'
+import React, { useState, useRef } from 'react'
+import { useShallow } from 'zustand/react/shallow'
 import { useProjectStore } from '../stores/projectStore'
 import { CyberButton, CyberInput, CyberCard, CyberCheckbox } from '../components/ui'
 import { FileTree, StatsPanel, ProgressDialog } from '../components/features'
@@ -8,14 +9,17 @@ declare global {
   interface Window {
     api: {
       file: {
-        scan: (rootDir: string, options?: { excludePatterns?: string[]; maxFileSize?: number }) => Promise<{ success: boolean; data?: any; error?: string }>
+        scan: (rootDir: string, options?: { excludePatterns?: string[]; maxFileSize?: number; scanId?: number }) => Promise<{ success: boolean; data?: any; error?: string; cancelled?: boolean }>
         generateContext: (files: any[], rootDir: string, includeLineNumbers?: boolean) => Promise<{ success: boolean; data?: string; error?: string }>
         getDefaultExcludePatterns: () => Promise<string[]>
         getSupportedExtensions: () => Promise<Record<string, string>>
+        cancelScan: () => Promise<any>
+        onScanBatch: (callback: (scanId: number, files: any[]) => void) => () => void
       }
       diff: {
         validate: (diffContent: string) => Promise<any>
         parse: (diffContent: string) => Promise<any>
+        prepare: (diffContent: string) => Promise<any>
         apply: (diffContent: string, projectRoot: string, options?: { createBackup?: boolean; dryRun?: boolean }) => Promise<any>
         checkConflicts: (diffContent: string, projectRoot: string) => Promise<any>
       }
@@ -64,20 +68,39 @@ export const ProjectSetup: React.FC<ProjectSetupProps> = ({ onNext }) => {
     projectRoot,
     setProjectRoot,
     setScanResult,
+    appendScannedFiles,
     maxFileSize,
     setMaxFileSize,
     includeLineNumbers,
     setIncludeLineNumbers,
     isScanning,
     setIsScanning,
-    scanProgress,
     setScanProgress,
     scanResult,
-    selectedFiles,
+    selection,
+    selectedCount,
     setContext
-  } = useProjectStore()
+  } = useProjectStore(useShallow((state) => ({
+    projectRoot: state.projectRoot,
+    setProjectRoot: state.setProjectRoot,
+    setScanResult: state.setScanResult,
+    appendScannedFiles: state.appendScannedFiles,
+    maxFileSize: state.maxFileSize,
+    setMaxFileSize: state.setMaxFileSize,
+    includeLineNumbers: state.includeLineNumbers,
+    setIncludeLineNumbers: state.setIncludeLineNumbers,
+    isScanning: state.isScanning,
+    setIsScanning: state.setIsScanning,
+    setScanProgress: state.setScanProgress,
+    scanResult: state.scanResult,
+    selection: state.selection,
+    selectedCount: state.selectedCount,
+    setContext: state.setContext
+  })))
 
   const [pathInput, setPathInput] = useState(projectRoot || '')
+  // 扫描令牌：每次扫描递增并作为扫描 ID 传给主进程，旧扫描迟到的批次和结果不再写入文件列表
+  const scanTokenRef = useRef(0)
 
   const handleBrowse = async () => {
     const path = await window.api.dialog.openDirectory()
@@ -93,28 +116,43 @@ export const ProjectSetup: React.FC<ProjectSetupProps> = ({ onNext }) => {
       return
     }
 
+    const token = ++scanTokenRef.current
+    const isCurrentScan = () => token === scanTokenRef.current
+
     setProjectRoot(pathInput)
+    setScanResult(null)
     setIsScanning(true)
     setScanProgress(0)
 
+    // 扫描过程中边扫描边填充文件列表
+    // 按批次自带的扫描 ID 过滤，旧扫描的批次即使在新扫描期间到达也会被丢弃
+    const unsubscribe = window.api.file.onScanBatch((scanId, files) => {
+      if (scanId === token && isCurrentScan()) appendScannedFiles(files)
+    })
+
     try {
       setScanProgress(30)
       const result = await window.api.file.scan(pathInput, {
-        maxFileSize: maxFileSize * 1024 * 1024
+        maxFileSize: maxFileSize * 1024 * 1024,
+        scanId: token
       })
 
+      // 期间已开始新的扫描，本次结果作废
+      if (!isCurrentScan()) return
+
       setScanProgress(70)
 
       if (result.success && result.data) {
         setScanResult(result.data)
         setScanProgress(100)
-      } else {
+      } else if (!result.cancelled) {
         alert(`扫描失败: ${result.error}`)
       }
     } catch (error) {
       alert(`扫描出错: ${error}`)
     } finally {
-      setIsScanning(false)
+      unsubscribe()
+      if (isCurrentScan()) setIsScanning(false)
     }
   }
 
@@ -124,7 +162,7 @@ export const ProjectSetup: React.FC<ProjectSetupProps> = ({ onNext }) => {
       return
     }
 
-    const selectedFilesData = scanResult.files.filter(f => selectedFiles.has(f.path))
+    const selectedFilesData = scanResult.files.filter((_, i) => selection[i] === 1)
     if (selectedFilesData.length === 0) {
       alert('请至少选择一个文件')
       return
@@ -213,19 +251,35 @@ export const ProjectSetup: React.FC<ProjectSetupProps> = ({ onNext }) => {
         <CyberButton
           variant="primary"
           onClick={handleGenerateContext}
-          disabled={!scanResult || selectedFiles.size === 0}
+          disabled={!scanResult || selectedCount === 0}
         >
           生成上下文
         </CyberButton>
       </div>
 
       {/* 进度对话框 */}
-      <ProgressDialog
-        isOpen={isScanning}
-        title="处理中..."
-        message={scanProgress < 50 ? '正在扫描文件...' : '正在生成上下文...'}
-        progress={scanProgress}
-      />
+      <ScanProgressDialog />
     </div>
   )
 }
+
+/**
+ * 单独订阅进度，进度更新时只重渲染对话框本身
+ */
+const ScanProgressDialog: React.FC = () => {
+  const isScanning = useProjectStore((state) => state.isScanning)
+  const scanProgress = useProjectStore((state) => state.scanProgress)
+  const foundCount = useProjectStore((state) => state.scanResult?.totalFiles || 0)
+
+  const isScanPhase = scanProgress < 50
+
+  return (
+    <ProgressDialog
+      isOpen={isScanning}
+      title="处理中..."
+      message={isScanPhase ? `正在扫描文件... 已发现 ${foundCount} 个` : '正在生成上下文...'}
+      progress={scanProgress}
+      onCancel={isScanPhase ? () => window.api.file.cancelScan() : undefined}
+    />
+  )
+}
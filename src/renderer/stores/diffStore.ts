@@ -6,6 +6,8 @@ export interface DiffHunk {
   newStart: number
   newCount: number
   lines: string[]
+  additions: number
+  deletions: number
 }
 
 export interface FileChange {
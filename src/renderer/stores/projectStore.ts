@@ -9,6 +9,8 @@ export interface FileInfo {
   sizeStr: string
   type: string
   isText: boolean
+  // 行数，扫描时统计
+  lines: number
 }
 
 export interface ScanResult {
@@ -23,7 +25,9 @@ interface ProjectState {
   // 项目状态
   projectRoot: string | null
   scanResult: ScanResult | null
-  selectedFiles: Set<string>
+  // 选中状态位图：下标与 scanResult.files 一一对应，1 表示选中
+  selection: Uint8Array
+  selectedCount: number
   context: string
   isScanning: boolean
   scanProgress: number
@@ -36,8 +40,9 @@ interface ProjectState {
   // Actions
   setProjectRoot: (path: string | null) => void
   setScanResult: (result: ScanResult | null) => void
-  setSelectedFiles: (files: Set<string>) => void
-  toggleFileSelection: (filePath: string) => void
+  appendScannedFiles: (files: FileInfo[]) => void
+  setSelection: (selection: Uint8Array) => void
+  toggleFileSelection: (index: number) => void
   selectAllFiles: () => void
   deselectAllFiles: () => void
   invertSelection: () => void
@@ -53,7 +58,8 @@ interface ProjectState {
 const initialState = {
   projectRoot: null,
   scanResult: null,
-  selectedFiles: new Set<string>(),
+  selection: new Uint8Array(0),
+  selectedCount: 0,
   context: '',
   isScanning: false,
   scanProgress: 0,
@@ -62,6 +68,11 @@ const initialState = {
   excludePatterns: []
 }
 
+// 扫描流式追加用的缓冲区：文件原地追加到同一数组，选中位图按容量倍增，
+// 每批只发布新的外层引用（scanResult 对象、位图视图），避免每批复制全部已扫描文件
+let scanFilesBuffer: FileInfo[] = []
+let selectionBuffer = new Uint8Array(0)
+
 export const useProjectStore = create<ProjectState>((set, get) => ({
   ...initialState,
 
@@ -70,46 +81,89 @@ export const useProjectStore = create<ProjectState>((set, get) => ({
   setScanResult: (result) => {
     if (result) {
       // 默认选中所有文件
-      const selectedFiles = new Set(result.files.map(f => f.path))
-      set({ scanResult: result, selectedFiles })
+      const count = result.files.length
+      set({ scanResult: result, selection: new Uint8Array(count).fill(1), selectedCount: count })
     } else {
-      set({ scanResult: result, selectedFiles: new Set() })
+      set({ scanResult: result, selection: new Uint8Array(0), selectedCount: 0 })
     }
   },
   
-  setSelectedFiles: (files) => set({ selectedFiles: files }),
+  appendScannedFiles: (files) => {
+    const { scanResult, selection, selectedCount } = get()
+    const prevCount = scanResult?.files.length || 0
+
+    // 当前文件列表不是本缓冲区（新的扫描或已被最终结果替换）时重新开始
+    if (!scanResult || scanResult.files !== scanFilesBuffer) {
+      scanFilesBuffer = scanResult ? scanResult.files.slice() : []
+    }
+    const fileTypes = { ...scanResult?.fileTypes }
+    let totalSize = scanResult?.totalSize || 0
+    let totalLines = scanResult?.totalLines || 0
+    for (const f of files) {
+      scanFilesBuffer.push(f)
+      fileTypes[f.extension] = (fileTypes[f.extension] || 0) + 1
+      totalSize += f.size
+      totalLines += f.lines
+    }
+    const total = scanFilesBuffer.length
+
+    // 位图不是缓冲区的视图（期间被切换选择替换过）或容量不足时，按两倍容量重新分配
+    if (selection.buffer !== selectionBuffer.buffer || selectionBuffer.length < total) {
+      const grown = new Uint8Array(Math.max(1024, total * 2))
+      grown.set(selection.subarray(0, prevCount))
+      selectionBuffer = grown
+    }
+    // 新发现的文件默认选中
+    selectionBuffer.fill(1, prevCount, total)
+    const newSelection = selectionBuffer.subarray(0, total)
+
+    set({
+      scanResult: {
+        files: scanFilesBuffer,
+        totalFiles: total,
+        totalSize,
+        totalLines,
+        fileTypes
+      },
+      selection: newSelection,
+      selectedCount: selectedCount + files.length
+    })
+  },
   
-  toggleFileSelection: (filePath) => {
-    const { selectedFiles } = get()
-    const newSelected = new Set(selectedFiles)
-    if (newSelected.has(filePath)) {
-      newSelected.delete(filePath)
-    } else {
-      newSelected.add(filePath)
+  setSelection: (selection) => {
+    let count = 0
+    for (let i = 0; i < selection.length; i++) {
+      count += selection[i]
     }
-    set({ selectedFiles: newSelected })
+    set({ selection, selectedCount: count })
+  },
+  
+  toggleFileSelection: (index) => {
+    const { selection, selectedCount } = get()
+    const newSelection = selection.slice()
+    newSelection[index] ^= 1
+    set({
+      selection: newSelection,
+      selectedCount: selectedCount + (newSelection[index] ? 1 : -1)
+    })
   },
   
   selectAllFiles: () => {
-    const { scanResult } = get()
-    if (scanResult) {
-      set({ selectedFiles: new Set(scanResult.files.map(f => f.path)) })
-    }
+    const { selection } = get()
+    set({ selection: new Uint8Array(selection.length).fill(1), selectedCount: selection.length })
   },
   
-  deselectAllFiles: () => set({ selectedFiles: new Set() }),
+  deselectAllFiles: () => {
+    const { selection } = get()
+    set({ selection: new Uint8Array(selection.length), selectedCount: 0 })
+  },
   
   invertSelection: () => {
-    const { scanResult, selectedFiles } = get()
-    if (scanResult) {
-      const newSelected = new Set<string>()
-      scanResult.files.forEach(f => {
-        if (!selectedFiles.has(f.path)) {
-          newSelected.add(f.path)
-        }
-      })
-      set({ selectedFiles: newSelected })
-    }
+    const { selection, selectedCount } = get()
+    set({
+      selection: selection.map(b => b ^ 1),
+      selectedCount: selection.length - selectedCount
+    })
   },
   
   setContext: (context) => set({ context }),
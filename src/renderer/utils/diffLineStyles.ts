@@ -0,0 +1,25 @@
+/**
+ * diff 行的样式
+ */
+
+// 增删行背景的不透明度（完整类名写出，Tailwind 才能扫描到）
+const LINE_STYLES = {
+  5: { add: 'text-success-green bg-success-green/5', delete: 'text-error-red bg-error-red/5' },
+  10: { add: 'text-success-green bg-success-green/10', delete: 'text-error-red bg-error-red/10' }
+}
+
+/**
+ * 按首字符判断 diff 行的样式，bgOpacity 为增删行背景的不透明度
+ */
+export function getDiffLineClassName(line: string, bgOpacity: 5 | 10): string {
+  switch (line[0]) {
+    case '+':
+      return line.startsWith('+++') ? 'text-warning-yellow' : LINE_STYLES[bgOpacity].add
+    case '-':
+      return line.startsWith('---') ? 'text-warning-yellow' : LINE_STYLES[bgOpacity].delete
+    case '@':
+      return line[1] === '@' ? 'text-neon-cyan' : 'text-ghost-white'
+    default:
+      return 'text-ghost-white'
+  }
+}